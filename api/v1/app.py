@@ -5,6 +5,10 @@ from flask import Flask, jsonify
 from flask_cors import CORS
 from models import storage
 from api.v1.views import app_views
+from api.v1.compression import compress
+from api.v1.json_provider import use_codec
+from api.v1.metrics import instrument
+from api.v1.profiling import profiling
 
 
 app = Flask(__name__)
@@ -17,6 +21,10 @@ RESOURCES = {RESOURCES_PATH: {'origins': ORIGINS}}
 CORS(app, resources=RESOURCES)
 
 app.register_blueprint(app_views)
+use_codec(app)
+compress(app)
+instrument(app)
+profiling(app)
 
 
 @app.teardown_appcontext
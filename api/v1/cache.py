@@ -0,0 +1,136 @@
+#!/usr/bin/python3
+"""In-process response cache for the GET endpoints"""
+from collections import OrderedDict
+from functools import wraps
+from flask import current_app, g, make_response, request
+from models import storage
+from os import getenv
+import threading
+import time
+
+FOREIGN_KEYS = ("state_id", "city_id", "place_id", "user_id")
+
+
+def tags_of(obj):
+    """Returns the tags of the cached responses obj can appear in"""
+    name = obj.__class__.__name__
+    tags = {(name,), (name, "id", obj.id)}
+    for attr in FOREIGN_KEYS:
+        value = getattr(obj, attr, None)
+        if value is not None:
+            tags.add((name, attr, value))
+    return tags
+
+
+class ResponseCache:
+    """LRU cache of response bodies bounded in size and age"""
+
+    def __init__(self, size=256, ttl=60):
+        """Instantiate an empty cache of at most size entries"""
+        self.size = size
+        self.ttl = ttl
+        self.__entries = OrderedDict()
+        self.__tagged = {}
+        self.generation = 0
+        self.__lock = threading.Lock()
+
+    def get(self, key):
+        """Returns the (body, status, headers) cached under key, or None"""
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                self._drop(key)
+                return None
+            self.__entries.move_to_end(key)
+            return entry[2]
+
+    def put(self, key, value, tags, generation):
+        """
+        Caches value under key until a change to one of tags, unless
+        something was invalidated since generation, when value was built
+        """
+        if self.size <= 0:
+            return
+        with self.__lock:
+            if generation != self.generation:
+                return
+            self._drop(key)
+            self.__entries[key] = (time.monotonic() + self.ttl, tags, value)
+            for tag in tags:
+                self.__tagged.setdefault(tag, set()).add(key)
+            while len(self.__entries) > self.size:
+                self._drop(next(iter(self.__entries)))
+
+    def _drop(self, key):
+        """Removes key from the entries and the tag index"""
+        entry = self.__entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[1]:
+            keys = self.__tagged.get(tag)
+            keys.discard(key)
+            if not keys:
+                del self.__tagged[tag]
+
+    def invalidate(self, obj):
+        """Drops the entries obj can appear in, or all of them for None"""
+        with self.__lock:
+            self.generation += 1
+            if obj is None:
+                self.__entries.clear()
+                self.__tagged.clear()
+                return
+            for tag in tags_of(obj):
+                for key in list(self.__tagged.get(tag, ())):
+                    self._drop(key)
+
+    def __len__(self):
+        """Returns the number of cached entries"""
+        return len(self.__entries)
+
+
+cache = ResponseCache(int(getenv('HBNB_API_CACHE_SIZE', 256)),
+                      float(getenv('HBNB_API_CACHE_TTL', 60)))
+storage.subscribe(cache.invalidate)
+
+
+def cached(cls, parent=None):
+    """
+    Decorates a collection view of cls to serve its 200 responses from
+    the cache. parent is a (class, view argument) pair naming the object
+    the collection belongs to; the view argument is also the foreign key
+    linking cls to it. Entries are dropped when an object of cls (linked
+    to that parent) or the parent itself is saved or deleted. Under
+    conditional, entries are also keyed by the ETag of the collection,
+    so the changes other processes make to the database are never
+    served from an entry built before them.
+    """
+    def tags(kwargs):
+        """Returns the tags of the response to a request"""
+        if parent is None:
+            return [(cls.__name__,)]
+        value = kwargs[parent[1]]
+        return [(cls.__name__, parent[1], value),
+                (parent[0].__name__, "id", value)]
+
+    def decorator(view):
+        """Wraps view with the cache lookup"""
+        @wraps(view)
+        def wrapper(**kwargs):
+            """Returns the cached response or caches the view's one"""
+            key = (request.full_path, request.headers.get("Accept", ""),
+                   g.get("etag"))
+            value = cache.get(key)
+            if value is not None:
+                return current_app.response_class(*value)
+            generation = cache.generation
+            response = make_response(view(**kwargs))
+            if response.status_code == 200 and not response.is_streamed:
+                value = (response.get_data(), response.status_code,
+                         list(response.headers.items()))
+                cache.put(key, value, tags(kwargs), generation)
+            return response
+        return wrapper
+    return decorator
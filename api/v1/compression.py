@@ -0,0 +1,100 @@
+#!/usr/bin/python3
+"""Negotiated gzip, deflate and brotli compression of responses"""
+from collections import OrderedDict
+from flask import request
+from os import getenv
+import threading
+import zlib
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# bodies smaller than this many bytes are sent as they are
+MIN_SIZE = int(getenv('HBNB_COMPRESS_MIN_SIZE', 1024))
+# zlib level, also used as the brotli quality
+LEVEL = int(getenv('HBNB_COMPRESS_LEVEL', 6))
+# compressed bodies kept by (ETag, encoding)
+MEMO_SIZE = int(getenv('HBNB_COMPRESS_MEMO_SIZE', 128))
+MIMETYPES = ("application/json", "application/x-ndjson", "text/html",
+             "text/plain", "text/css", "application/javascript")
+# in order of preference when the client likes several equally
+ENCODINGS = (["br"] if brotli is not None else []) + ["gzip", "deflate"]
+
+memo = OrderedDict()
+memo_lock = threading.Lock()
+
+
+def compressor(encoding):
+    """Returns the compress and flush functions of a new compressor"""
+    if encoding == "br":
+        obj = brotli.Compressor(quality=min(LEVEL, 11))
+        return obj.process, obj.finish
+    obj = zlib.compressobj(LEVEL, zlib.DEFLATED,
+                           31 if encoding == "gzip" else 15)
+    return obj.compress, obj.flush
+
+
+def compress_body(data, encoding, etag=None):
+    """
+    Returns data compressed with encoding, reusing the bytes compressed
+    earlier for the same ETag
+    """
+    if etag is not None:
+        with memo_lock:
+            body = memo.get((etag, encoding))
+            if body is not None:
+                memo.move_to_end((etag, encoding))
+                return body
+    compress, flush = compressor(encoding)
+    body = compress(data) + flush()
+    if etag is not None and MEMO_SIZE > 0:
+        with memo_lock:
+            memo[(etag, encoding)] = body
+            while len(memo) > MEMO_SIZE:
+                memo.popitem(last=False)
+    return body
+
+
+def compress_stream(chunks, encoding):
+    """Yields the chunks of a streamed body compressed with encoding"""
+    compress, flush = compressor(encoding)
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode("utf-8")
+        data = compress(chunk)
+        if data:
+            yield data
+    yield flush()
+
+
+def compressed(response):
+    """Compresses response with the best encoding the client accepts"""
+    if response.status_code != 200 or response.direct_passthrough or \
+            "Content-Encoding" in response.headers or \
+            response.mimetype not in MIMETYPES:
+        return response
+    if not response.is_streamed and len(response.get_data()) < MIN_SIZE:
+        return response
+    response.vary.add("Accept-Encoding")
+    encoding = request.accept_encodings.best_match(ENCODINGS)
+    if encoding is None:
+        return response
+    etag, weak = response.get_etag()
+    if response.is_streamed:
+        response.response = compress_stream(response.response, encoding)
+        response.headers.pop("Content-Length", None)
+    else:
+        response.set_data(compress_body(response.get_data(), encoding,
+                                        etag))
+    response.headers["Content-Encoding"] = encoding
+    if etag is not None:
+        # the bytes differ from the identity ones, the meaning does not
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def compress(app):
+    """Compresses the responses of app for the clients that accept it"""
+    app.after_request(compressed)
+    return app
@@ -0,0 +1,88 @@
+#!/usr/bin/python3
+"""ETag and Last-Modified support for the GET endpoints"""
+from datetime import timezone
+from functools import wraps
+from flask import g, jsonify, make_response, request
+from api.v1.fields import requested_fields
+import hashlib
+from models import storage
+
+
+def make_etag(*parts):
+    """Returns a strong ETag for parts and the representation asked for"""
+    parts += (request.full_path, request.headers.get("Accept", ""))
+    token = "|".join(str(part) for part in parts).encode("utf-8")
+    return hashlib.sha1(token).hexdigest()
+
+
+def not_modified(etag, last_modified=None):
+    """
+    Returns a 304 response when the request validators show the client
+    already holds the current representation, otherwise None
+    """
+    if request.if_none_match:
+        if not request.if_none_match.contains_weak(etag):
+            return None
+    elif last_modified is None or request.if_modified_since is None:
+        return None
+    elif last_modified.replace(microsecond=0, tzinfo=timezone.utc) > \
+            request.if_modified_since:
+        return None
+    response = make_response("", 304)
+    return validated(response, etag, last_modified)
+
+
+def validated(response, etag, last_modified=None):
+    """Sets the ETag and Last-Modified headers of response"""
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified.replace(tzinfo=timezone.utc)
+    return response
+
+
+def object_response(obj):
+    """Returns obj as JSON, or 304 if the client's copy is current"""
+    etag = make_etag(obj.__class__.__name__, obj.id, obj.updated_at)
+    response = not_modified(etag, obj.updated_at)
+    if response is None:
+        obj_dict = obj.to_dict(fields=requested_fields())
+        response = validated(jsonify(obj_dict), etag, obj.updated_at)
+    return response
+
+
+def conditional(cls, parent=None):
+    """
+    Decorates a collection view of cls so it answers 304 while the
+    collection is unchanged. parent is a (class, view argument) pair
+    naming the object the collection belongs to; the view argument is
+    also the foreign key linking cls to it.
+    """
+    def decorator(view):
+        """Wraps view with the conditional GET checks"""
+        @wraps(view)
+        def wrapper(**kwargs):
+            """Answers 304 or calls the view and adds validators"""
+            where, parts, stamps = {}, [cls.__name__], []
+            if parent is not None:
+                owner = storage.get(parent[0], kwargs[parent[1]])
+                if owner is None:
+                    return view(**kwargs)
+                where[parent[1]] = owner.id
+                parts.append(owner.updated_at)
+                stamps.append(owner.updated_at)
+            version, modified = storage.version(cls, **where)
+            parts.append(version)
+            if modified is not None:
+                stamps.append(modified)
+            etag = make_etag(*parts)
+            last_modified = max(stamps) if stamps else None
+            response = not_modified(etag, last_modified)
+            if response is not None:
+                return response
+            g.etag = etag
+            response = make_response(view(**kwargs))
+            if response.status_code == 200:
+                validated(response, etag, last_modified)
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,14 @@
+#!/usr/bin/python3
+"""Sparse fieldsets selected by the fields parameter"""
+from flask import request
+
+
+def requested_fields():
+    """
+    Returns the attribute names listed by the comma separated fields
+    parameter as a tuple, or None to keep every attribute
+    """
+    fields = request.args.get("fields")
+    if fields is None:
+        return None
+    return tuple(name for name in fields.split(",") if name)
@@ -0,0 +1,28 @@
+#!/usr/bin/python3
+"""Flask JSON provider encoding and decoding with the models' codec"""
+from flask.json.provider import DefaultJSONProvider
+from models import codec
+
+
+class CodecJSONProvider(DefaultJSONProvider):
+    """Flask's default JSON provider, made faster by the shared codec"""
+
+    def dumps(self, obj, **kwargs):
+        """Serializes obj like the default provider, with the codec"""
+        if codec.name == "json" or set(kwargs) - {"indent", "separators"}:
+            return super().dumps(obj, **kwargs)
+        # a fast codec writes compactly unless it indents
+        return codec.dumps(obj, sort_keys=self.sort_keys,
+                           default=self.default, indent=kwargs.get("indent"))
+
+    def loads(self, s, **kwargs):
+        """Deserializes s, a str or UTF-8 bytes, with the codec"""
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return codec.loads(s)
+
+
+def use_codec(app):
+    """Makes app encode and decode JSON with the shared codec"""
+    app.json = CodecJSONProvider(app)
+    return app
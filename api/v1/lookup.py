@@ -0,0 +1,29 @@
+#!/usr/bin/python3
+"""Fetching many objects by id in a single request"""
+from flask import abort, jsonify, request
+from api.v1.fields import requested_fields
+from models import storage
+from os import getenv
+
+# largest number of ids a single request may ask for
+IDS_MAX = int(getenv('HBNB_API_IDS_MAX', 1000))
+
+
+def fetch(cls, ids):
+    """Returns the objects of cls with the given ids as a JSON response"""
+    if len(ids) > IDS_MAX:
+        abort(400, "Too many ids")
+    fields = requested_fields()
+    return jsonify([obj.to_dict(fields=fields)
+                    for obj in storage.get_many(cls, ids, fields=fields)])
+
+
+def by_ids(cls):
+    """
+    Returns the objects of cls listed by the comma separated ids
+    parameter as a JSON response, or None without that parameter
+    """
+    ids = request.args.get("ids")
+    if ids is None:
+        return None
+    return fetch(cls, [id for id in ids.split(",") if id])
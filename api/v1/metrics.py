@@ -0,0 +1,208 @@
+#!/usr/bin/python3
+"""Request latency and storage call metrics in the Prometheus format"""
+from flask import Response, abort, g, has_request_context, request
+from models import spans, storage
+from os import getenv
+import threading
+import time
+
+# requests slower than this many seconds are logged
+SLOW_SECONDS = float(getenv('HBNB_SLOW_REQUEST_MS', 500)) / 1000
+# requests making more storage calls than this are logged
+SLOW_CALLS = int(getenv('HBNB_SLOW_REQUEST_CALLS', 50))
+# serve /metrics to other hosts than this one
+PUBLIC = getenv('HBNB_METRICS_PUBLIC', '0') in ('1', 'true')
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+CALL_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 1000)
+# pool statistics of DBStorage: (metric, statistic, type, help)
+POOL_METRICS = (
+    ("hbnb_db_pool_size", "size", "gauge", "Connections the pool keeps."),
+    ("hbnb_db_pool_checked_out", "checked_out", "gauge",
+     "Connections in use."),
+    ("hbnb_db_pool_overflow", "overflow", "gauge",
+     "Connections opened over the pool size."),
+    ("hbnb_db_pool_checkouts_total", "checkouts", "counter",
+     "Connection checkouts."),
+    ("hbnb_db_pool_timeouts_total", "timeouts", "counter",
+     "Checkouts that timed out waiting for a connection."),
+    ("hbnb_db_pool_wait_seconds_total", "wait_seconds", "counter",
+     "Time spent waiting for a connection."),
+    ("hbnb_db_pool_max_wait_seconds", "max_wait_seconds", "gauge",
+     "Longest wait for a connection."))
+# storage methods whose spans are counted as storage calls
+STORAGE_METHODS = ("all", "get", "get_many", "count", "counts", "page",
+                   "search_places", "version", "new", "delete", "save")
+
+
+class Histogram:
+    """Cumulative bucket counts, sum and count of observed values"""
+
+    def __init__(self, buckets):
+        """Instantiate an empty histogram"""
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value):
+        """Adds value to the histogram"""
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+        self.sum += value
+        self.count += 1
+
+    def lines(self, name, labels):
+        """Returns the exposition lines of the histogram"""
+        lines = []
+        for bound, count in zip(self.buckets + ("+Inf",),
+                                self.counts + [self.count]):
+            lines.append('{}_bucket{{{}le="{}"}} {}'.format(
+                name, labels, bound, count))
+        lines.append("{}_sum{{{}}} {}".format(name, labels.rstrip(","),
+                                              self.sum))
+        lines.append("{}_count{{{}}} {}".format(name, labels.rstrip(","),
+                                                self.count))
+        return lines
+
+
+class Metrics:
+    """Latency of every route and time spent in every storage method"""
+
+    def __init__(self):
+        """Instantiate empty metrics"""
+        self.__lock = threading.Lock()
+        self.requests = {}
+        self.request_calls = {}
+        self.calls = {}
+
+    def observe_request(self, route, method, status, seconds, calls):
+        """Records a finished request and the storage calls it made"""
+        with self.__lock:
+            key = (route, method, status)
+            if key not in self.requests:
+                self.requests[key] = Histogram(BUCKETS)
+            self.requests[key].observe(seconds)
+            if (route, method) not in self.request_calls:
+                self.request_calls[(route, method)] = Histogram(CALL_BUCKETS)
+            self.request_calls[(route, method)].observe(calls)
+
+    def observe_call(self, name, seconds):
+        """Records a call to a storage method"""
+        with self.__lock:
+            total = self.calls.setdefault(name, [0, 0])
+            total[0] += 1
+            total[1] += seconds
+
+    def render(self):
+        """Returns every metric in the Prometheus text format"""
+        lines = ["# HELP hbnb_request_duration_seconds Request latency.",
+                 "# TYPE hbnb_request_duration_seconds histogram"]
+        with self.__lock:
+            for (route, method, status), hist in sorted(
+                    self.requests.items()):
+                lines += hist.lines(
+                    "hbnb_request_duration_seconds",
+                    'route="{}",method="{}",status="{}",'.format(
+                        route, method, status))
+            lines += ["# HELP hbnb_request_storage_calls Storage calls "
+                      "made by a request.",
+                      "# TYPE hbnb_request_storage_calls histogram"]
+            for (route, method), hist in sorted(self.request_calls.items()):
+                lines += hist.lines(
+                    "hbnb_request_storage_calls",
+                    'route="{}",method="{}",'.format(route, method))
+            lines += ["# HELP hbnb_storage_calls_total Storage calls.",
+                      "# TYPE hbnb_storage_calls_total counter"]
+            for name, (count, seconds) in sorted(self.calls.items()):
+                lines.append('hbnb_storage_calls_total{{method="{}"}} {}'.
+                             format(name, count))
+            lines += ["# HELP hbnb_storage_call_seconds_total Time spent "
+                      "in storage calls.",
+                      "# TYPE hbnb_storage_call_seconds_total counter"]
+            for name, (count, seconds) in sorted(self.calls.items()):
+                lines.append('hbnb_storage_call_seconds_total{{method="{}"}}'
+                             ' {}'.format(name, seconds))
+        return "\n".join(lines) + "\n"
+
+
+metrics = Metrics()
+
+
+def observe_span(name, seconds):
+    """Records the spans of the storage methods as storage calls"""
+    owner, _, method = name.partition(".")
+    if owner != type(storage).__name__ or method not in STORAGE_METHODS:
+        return
+    metrics.observe_call(method, seconds)
+    if has_request_context() and "storage_calls" in g:
+        total = g.storage_calls.setdefault(method, [0, 0])
+        total[0] += 1
+        total[1] += seconds
+
+
+def start_timer():
+    """Starts timing the current request"""
+    g.request_start = time.perf_counter()
+    g.storage_calls = {}
+
+
+def keep_status(response):
+    """Remembers the status of the current response"""
+    g.response_status = response.status_code
+    return response
+
+
+def record(app):
+    """Returns the teardown function recording the requests of app"""
+    def record_request(exception):
+        """Records the current request, logging it if it was slow"""
+        if "request_start" not in g:
+            return
+        seconds = time.perf_counter() - g.request_start
+        route = request.url_rule.rule if request.url_rule else "unmatched"
+        status = g.get("response_status", 500)
+        calls = sum(count for count, _ in g.storage_calls.values())
+        metrics.observe_request(route, request.method, status, seconds,
+                                calls)
+        if seconds > SLOW_SECONDS or calls > SLOW_CALLS:
+            app.logger.warning(
+                "slow request: %s %s %s in %.1f ms, %d storage calls (%s)",
+                request.method, request.full_path, status, seconds * 1000,
+                calls, ", ".join("{} {}x {:.1f} ms".format(
+                    name, count, total * 1000) for name, (count, total)
+                    in sorted(g.storage_calls.items())))
+    return record_request
+
+
+def pool_lines():
+    """Returns the exposition lines of the database connection pool"""
+    if not hasattr(storage, "pool_stats"):
+        return ""
+    stats = storage.pool_stats()
+    lines = []
+    for name, key, kind, text in POOL_METRICS:
+        if key in stats:
+            lines += ["# HELP {} {}".format(name, text),
+                      "# TYPE {} {}".format(name, kind),
+                      "{} {}".format(name, stats[key])]
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+def show_metrics():
+    """Returns the collected metrics in the Prometheus text format"""
+    if not PUBLIC and request.remote_addr not in ("127.0.0.1", "::1"):
+        abort(404)
+    return Response(metrics.render() + pool_lines(),
+                    content_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+def instrument(app):
+    """Times the requests of app and the storage calls they make"""
+    if observe_span not in spans.hooks:
+        spans.hooks.append(observe_span)
+    app.before_request(start_timer)
+    app.after_request(keep_status)
+    app.teardown_request(record(app))
+    app.add_url_rule("/metrics", view_func=show_metrics)
+    return app
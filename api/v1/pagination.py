@@ -0,0 +1,71 @@
+#!/usr/bin/python3
+"""Keyset pagination for the collection endpoints"""
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from flask import abort, jsonify, request, url_for
+from api.v1.fields import requested_fields
+from models import storage
+from models.timestamps import parse
+
+
+def position(obj):
+    """Returns the (created_at, id) pair that orders obj in a page"""
+    return obj.stamp("created_at"), obj.id
+
+
+def encode_cursor(obj):
+    """Returns the opaque cursor pointing just after obj"""
+    token = "{}|{}".format(*position(obj)).encode("utf-8")
+    return urlsafe_b64encode(token).decode("ascii")
+
+
+def decode_cursor(cursor):
+    """Returns the (created_at, id) pair held by a cursor"""
+    try:
+        created_at, obj_id = urlsafe_b64decode(cursor.encode("ascii")).\
+            decode("utf-8").split("|", 1)
+        parse(created_at)
+    except (ValueError, UnicodeError):
+        abort(400, "Invalid cursor")
+    return created_at, obj_id
+
+
+def paginate(cls, **where):
+    """
+    Returns one page of cls as a JSON response when the request has a
+    limit parameter, otherwise None. The next page, if any, is linked
+    from the Link header.
+    """
+    limit = request.args.get("limit")
+    if limit is None:
+        return None
+    if not limit.isdigit() or int(limit) == 0:
+        abort(400, "Invalid limit")
+    limit = int(limit)
+    cursor = request.args.get("cursor")
+    after = decode_cursor(cursor) if cursor else None
+    fields = requested_fields()
+
+    objs = storage.page(cls, limit, after, fields=fields, **where)
+    response = jsonify([obj.to_dict(fields=fields) for obj in objs])
+    if len(objs) == limit:
+        # the next page keeps every other query parameter, like fields
+        args = dict(request.args.to_dict(flat=False), **request.view_args)
+        args.update(limit=limit, cursor=encode_cursor(objs[-1]))
+        response.headers["Link"] = '<{}>; rel="next"'.format(
+            url_for(request.endpoint, **args))
+    return response
+
+
+def iterate(cls, batch=500, fields=None, **where):
+    """
+    Yields every object of cls in page order, one page at a time, loading
+    only fields when it is given
+    """
+    after = None
+    while True:
+        objs = storage.page(cls, batch, after, fields=fields, **where)
+        for obj in objs:
+            yield obj
+        if len(objs) < batch:
+            return
+        after = position(objs[-1])
@@ -0,0 +1,231 @@
+#!/usr/bin/python3
+"""On-demand cProfile and sampling profiles of a live API worker"""
+from collections import Counter
+import cProfile
+from flask import Response, abort, g, jsonify, request
+import hmac
+import io
+from models import spans
+import os
+from os import getenv
+import pstats
+import sys
+import threading
+import time
+
+# secret sent in X-Profile-Token; profiling is off without it
+TOKEN = getenv('HBNB_PROFILE_TOKEN')
+# time between two samples of the sampling profiler
+INTERVAL = float(getenv('HBNB_PROFILE_INTERVAL_MS', 5)) / 1000
+MODES = ("cprofile", "sample")
+
+
+class Session:
+    """A profile captured for the next requests or for some seconds"""
+
+    def __init__(self, mode, requests=None, seconds=None):
+        """Starts capturing a profile"""
+        self.mode = mode
+        self.remaining = requests
+        self.deadline = None if seconds is None else \
+            time.monotonic() + seconds
+        self.profiled = 0
+        self.done = False
+        self.stats = None
+        self.stacks = Counter()
+        self.spans = {}
+        self.threads = set()
+        self.__lock = threading.Lock()
+        self.__busy = threading.Lock()
+        spans.hooks.append(self.span)
+        if mode == "sample":
+            threading.Thread(target=self.sample, daemon=True).start()
+
+    def active(self):
+        """Tells whether the profile is still being captured"""
+        if not self.done and self.deadline is not None and \
+                time.monotonic() >= self.deadline:
+            self.finish()
+        return not self.done
+
+    def finish(self):
+        """Stops capturing the profile"""
+        with self.__lock:
+            if self.done:
+                return
+            self.done = True
+        if self.span in spans.hooks:
+            spans.hooks.remove(self.span)
+
+    def span(self, name, seconds):
+        """Adds a span reported by the models to the profile"""
+        if threading.get_ident() not in self.threads:
+            return
+        with self.__lock:
+            total = self.spans.setdefault(name, [0, 0])
+            total[0] += 1
+            total[1] += seconds
+
+    def start_request(self):
+        """Starts profiling the current request, if it is wanted"""
+        if not self.active():
+            return False
+        if self.mode == "cprofile":
+            # cProfile cannot watch two threads at once on every version
+            if not self.__busy.acquire(blocking=False):
+                return False
+            g.profiler = cProfile.Profile()
+            g.profiler.enable()
+        self.threads.add(threading.get_ident())
+        return True
+
+    def end_request(self):
+        """Stops profiling the current request and adds it up"""
+        self.threads.discard(threading.get_ident())
+        profiler = g.pop("profiler", None)
+        if profiler is not None:
+            profiler.disable()
+            with self.__lock:
+                if self.stats is None:
+                    self.stats = pstats.Stats(profiler)
+                else:
+                    self.stats.add(profiler)
+            self.__busy.release()
+        with self.__lock:
+            self.profiled += 1
+            if self.remaining is not None:
+                self.remaining -= 1
+            last = self.remaining is not None and self.remaining <= 0
+        if last:
+            self.finish()
+
+    def sample(self):
+        """Collects the stacks of the profiled requests until done"""
+        while self.active():
+            frames = sys._current_frames()
+            for ident in list(self.threads):
+                frame = frames.get(ident)
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append("{} ({}:{})".format(
+                        code.co_name, os.path.basename(code.co_filename),
+                        code.co_firstlineno))
+                    frame = frame.f_back
+                if stack:
+                    self.stacks[";".join(reversed(stack))] += 1
+            time.sleep(INTERVAL)
+
+    def report(self, fmt):
+        """Returns the profile as text, collapsed stacks or JSON"""
+        if fmt == "json":
+            return jsonify({"mode": self.mode, "requests": self.profiled,
+                            "samples": sum(self.stacks.values()),
+                            "spans": {name: {"calls": count,
+                                             "seconds": seconds}
+                                      for name, (count, seconds)
+                                      in self.spans.items()}})
+        if fmt == "collapsed":
+            if self.mode != "sample":
+                abort(400, "Collapsed stacks need the sample mode")
+            text = "".join("{} {}\n".format(stack, count)
+                           for stack, count in self.stacks.items())
+            return Response(text, mimetype="text/plain")
+        out = io.StringIO()
+        out.write("{} profile of {} requests\n\n".format(
+            self.mode, self.profiled))
+        if self.stats is not None:
+            self.stats.stream = out
+            self.stats.sort_stats("cumulative").print_stats(50)
+        for stack, count in self.stacks.most_common(50):
+            out.write("{} {}\n".format(count, stack.rsplit(";", 1)[-1]))
+        out.write("\nspans:\n")
+        for name, (count, seconds) in sorted(self.spans.items()):
+            out.write("{} {} calls {:.1f} ms\n".format(name, count,
+                                                       seconds * 1000))
+        return Response(out.getvalue(), mimetype="text/plain")
+
+
+session = None
+
+
+def allowed():
+    """Stops requests that do not carry the profiling token"""
+    if TOKEN is None:
+        abort(404)
+    if not hmac.compare_digest(request.headers.get("X-Profile-Token", ""),
+                               TOKEN):
+        abort(403)
+
+
+def start_profile():
+    """Starts a profile of the next requests or of the next seconds"""
+    global session
+    payload = request.get_json(silent=True)
+    if not isinstance(payload, dict):
+        abort(400, "Not a JSON")
+    mode = payload.get("mode", "cprofile")
+    requests, seconds = payload.get("requests"), payload.get("seconds")
+    if mode not in MODES:
+        abort(400, "Unknown mode")
+    if (requests is None) == (seconds is None):
+        abort(400, "Give requests or seconds")
+    limit = requests if seconds is None else seconds
+    if type(limit) not in (int, float) or limit <= 0:
+        abort(400, "Invalid limit")
+    if session is not None and session.active():
+        abort(409)
+    session = Session(mode, requests, seconds)
+    return jsonify({"mode": mode, "requests": requests,
+                    "seconds": seconds}), 202
+
+
+def get_profile():
+    """Returns the last profile, or its progress while it runs"""
+    if session is None:
+        abort(404)
+    if session.active():
+        return jsonify({"status": "running",
+                        "requests": session.profiled}), 202
+    return session.report(request.args.get("format", "text"))
+
+
+def stop_profile():
+    """Stops the running profile early"""
+    if session is None:
+        abort(404)
+    session.finish()
+    return jsonify({}), 200
+
+
+def profile():
+    """Starts, reads or stops a profile for the token holder"""
+    allowed()
+    if request.method == "POST":
+        return start_profile()
+    if request.method == "DELETE":
+        return stop_profile()
+    return get_profile()
+
+
+def before_request():
+    """Profiles the current request when a profile is running"""
+    if session is not None and request.endpoint != "profile" and \
+            session.start_request():
+        g.profiled = session
+
+
+def teardown_request(exception):
+    """Adds the current request to the profile it was part of"""
+    profiled = g.pop("profiled", None)
+    if profiled is not None:
+        profiled.end_request()
+
+
+def profiling(app):
+    """Adds the token protected /profile endpoint to app"""
+    app.before_request(before_request)
+    app.teardown_request(teardown_request)
+    app.add_url_rule("/profile", view_func=profile,
+                     methods=["GET", "POST", "DELETE"])
+    return app
@@ -0,0 +1,40 @@
+#!/usr/bin/python3
+"""Streaming JSON and NDJSON responses for large collections"""
+from flask import Response, request, stream_with_context
+from models import codec
+
+NDJSON = "application/x-ndjson"
+
+
+def wants_ndjson():
+    """Tells whether the client prefers NDJSON over a JSON array"""
+    best = request.accept_mimetypes.best_match(["application/json", NDJSON])
+    return best == NDJSON
+
+
+def stream_list(objs, transform=None, fields=None):
+    """
+    Returns a response that serializes objs one at a time, as a JSON
+    array or as NDJSON when the client asks for it. transform, when
+    given, is applied to each dictionary before it is written; fields
+    limits the dictionaries to the attributes it names.
+    """
+    ndjson = wants_ndjson()
+
+    def generate():
+        """Yields the response body piece by piece"""
+        sep = "" if ndjson else "["
+        for obj in objs:
+            obj_dict = obj.to_dict(fields=fields)
+            if transform is not None:
+                transform(obj_dict)
+            if ndjson:
+                yield codec.dumps(obj_dict) + "\n"
+            else:
+                yield sep + codec.dumps(obj_dict)
+                sep = ","
+        if not ndjson:
+            yield "[]\n" if sep == "[" else "]\n"
+
+    mimetype = NDJSON if ndjson else "application/json"
+    return Response(stream_with_context(generate()), mimetype=mimetype)
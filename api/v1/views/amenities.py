@@ -5,14 +5,28 @@ from models import storage
 from models.amenity import Amenity
 from models.state import State
 from api.v1.views import app_views
+from api.v1.pagination import paginate
+from api.v1.cache import cached
+from api.v1.lookup import by_ids
+from api.v1.fields import requested_fields
+from api.v1.conditional import conditional, object_response
 
 
 @app_views.route("/amenities", strict_slashes=False)
+@conditional(Amenity)
+@cached(Amenity)
 def get_amenities():
     """Return the full list of available amenities in a state"""
+    found = by_ids(Amenity)
+    if found is not None:
+        return found
+    page = paginate(Amenity)
+    if page is not None:
+        return page
+    fields = requested_fields()
     amenities = []
-    for k, v in storage.all(Amenity).items():
-        amenities.append(v.to_dict())
+    for k, v in storage.all(Amenity, fields=fields).items():
+        amenities.append(v.to_dict(fields=fields))
     response = jsonify(amenities)
 
     return response
@@ -24,7 +38,7 @@ def get_specific_amenities(amenity_id):
     amenity = storage.get(Amenity, amenity_id)
 
     if amenity:
-        return jsonify(amenity.to_dict())
+        return object_response(amenity)
     else:
         return abort(404)
 
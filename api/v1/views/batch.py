@@ -0,0 +1,175 @@
+#!/usr/bin/python3
+"""Endpoints creating, updating or deleting many objects at once"""
+from datetime import datetime
+from flask import abort, jsonify, request
+from os import getenv
+from api.v1.lookup import fetch
+from api.v1.views import app_views
+from models import storage
+from models.amenity import Amenity
+from models.city import City
+from models.place import Place
+from models.review import Review
+from models.state import State
+from models.user import User
+
+# largest number of items a single batch request may hold
+BATCH_MAX = int(getenv('HBNB_API_BATCH_MAX', 1000))
+
+# collection: (class, required keys, parent class of each foreign key,
+#              keys an update leaves alone, relationships included)
+RESOURCES = {
+    "states": (State, ("name",), {}, ("cities",)),
+    "amenities": (Amenity, ("name",), {}, ()),
+    "users": (User, ("email", "password"), {},
+              ("email", "places", "reviews")),
+    "cities": (City, ("state_id", "name"), {"state_id": State},
+               ("state_id", "places")),
+    "places": (Place, ("city_id", "user_id", "name"),
+               {"city_id": City, "user_id": User},
+               ("city_id", "user_id", "reviews", "amenities")),
+    "reviews": (Review, ("place_id", "user_id", "text"),
+                {"place_id": Place, "user_id": User},
+                ("place_id", "user_id")),
+}
+IGNORED = ('id', 'created_at', 'updated_at')
+
+
+def batch_payload():
+    """Returns the list of items in the request body"""
+    if request.content_type != "application/json":
+        abort(400, "Not a JSON")
+    payload = request.get_json(silent=True)
+    if not isinstance(payload, list):
+        abort(400, "Not a JSON")
+    if len(payload) > BATCH_MAX:
+        abort(400, "Too many items")
+    return payload
+
+
+def failure(status, error):
+    """Returns the result of an item that was not applied"""
+    return {"status": status, "error": error}
+
+
+def serialized(results):
+    """Returns results with their saved objects turned into dictionaries"""
+    return [dict(result, object=result["object"].to_dict())
+            if "object" in result else result for result in results]
+
+
+def create_item(cls, required, parents, item, known):
+    """Returns the new object for item, or the reason it is invalid"""
+    if not isinstance(item, dict):
+        return failure(400, "Not a JSON")
+    for key in required:
+        if key not in item:
+            return failure(400, "Missing " + key)
+    for key, parent in parents.items():
+        if not isinstance(item[key], str):
+            return failure(404, "Not found")
+        if (parent, item[key]) not in known:
+            known[(parent, item[key])] = storage.get(parent, item[key])
+        if known[(parent, item[key])] is None:
+            return failure(404, "Not found")
+    # the id and timestamps of a new object are never the client's
+    attrs = {key: value for key, value in item.items()
+             if key not in IGNORED and key != "__class__"}
+    try:
+        return cls(**attrs)
+    except (AttributeError, TypeError, ValueError):
+        return failure(400, "Invalid " + cls.__name__)
+
+
+def create_batch(collection):
+    """Creates every valid item of a list, saving storage once"""
+    cls, required, parents, _ = RESOURCES[collection]
+    results, known = [], {}
+    for item in batch_payload():
+        obj = create_item(cls, required, parents, item, known)
+        if isinstance(obj, dict):
+            results.append(obj)
+        else:
+            results.append({"status": 201, "object": obj})
+    # nothing reaches storage before every item has been built
+    for result in results:
+        if "object" in result:
+            storage.new(result["object"])
+    storage.save()
+    return jsonify(serialized(results))
+
+
+def update_item(cls, ignored, item):
+    """Returns the object and changes of item, or the reason it is invalid"""
+    if not isinstance(item, dict) or not isinstance(item.get("id"), str):
+        return failure(400, "Missing id")
+    obj = storage.get(cls, item["id"])
+    if obj is None:
+        return failure(404, "Not found")
+    changes = {key: value for key, value in item.items()
+               if key not in IGNORED and key not in ignored and
+               key != "__class__"}
+    # tried on a throwaway instance, so a bad item changes no object
+    scratch = cls()
+    try:
+        for key, value in changes.items():
+            setattr(scratch, key, value)
+    except Exception:
+        return failure(400, "Invalid " + cls.__name__)
+    return obj, changes
+
+
+def update_batch(collection):
+    """Updates the objects named by the id of every item, saving once"""
+    cls, _, _, ignored = RESOURCES[collection]
+    results, updates = [], []
+    for item in batch_payload():
+        update = update_item(cls, ignored, item)
+        if isinstance(update, dict):
+            results.append(update)
+        else:
+            updates.append(update)
+            results.append({"status": 200, "object": update[0]})
+    # nothing changes before every item has been checked
+    for obj, changes in updates:
+        for key, value in changes.items():
+            setattr(obj, key, value)
+        obj.updated_at = datetime.utcnow()
+        storage.new(obj)
+    storage.save()
+    return jsonify(serialized(results))
+
+
+def delete_batch(collection):
+    """Deletes the objects of a list of ids, saving storage once"""
+    cls = RESOURCES[collection][0]
+    results = []
+    for obj_id in batch_payload():
+        obj = storage.get(cls, obj_id) if isinstance(obj_id, str) else None
+        if obj is None:
+            results.append(failure(404, "Not found"))
+            continue
+        storage.delete(obj)
+        results.append({"status": 200, "id": obj_id})
+    storage.save()
+    return jsonify(results)
+
+
+def lookup_batch(collection):
+    """Returns the objects of a list of ids"""
+    return fetch(RESOURCES[collection][0], batch_payload())
+
+
+# /<collection>/batch would lose to routes such as /cities/<city_id>,
+# so every collection gets its own batch and lookup rules
+for collection in RESOURCES:
+    for view, method in ((create_batch, "POST"), (update_batch, "PUT"),
+                         (delete_batch, "DELETE")):
+        app_views.add_url_rule("/{}/batch".format(collection),
+                               view_func=view, methods=[method],
+                               defaults={"collection": collection},
+                               strict_slashes=False)
+    app_views.add_url_rule("/{}/lookup".format(collection),
+                           view_func=lookup_batch, methods=["POST"],
+                           defaults={"collection": collection},
+                           strict_slashes=False)
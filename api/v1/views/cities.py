@@ -5,21 +5,44 @@ from flask import request, jsonify, abort
 from models import storage
 from models.state import State
 from models.city import City
+from api.v1.pagination import paginate
+from api.v1.cache import cached
+from api.v1.lookup import by_ids
+from api.v1.fields import requested_fields
+from api.v1.conditional import conditional, object_response
 
 
 @app_views.route("/states/<state_id>/cities", strict_slashes=False)
+@conditional(City, parent=(State, "state_id"))
+@cached(City, parent=(State, "state_id"))
 def get_state_city(state_id):
     """Retrieve the cities of a particular state"""
-    state = storage.get(State, state_id)
+    state = storage.get(State, state_id, eager=("cities",))
     if not state:
         return abort(404)
 
-    cities = [city.to_dict() for city in state.cities]
+    page = paginate(City, state_id=state_id)
+    if page is not None:
+        return page
+
+    fields = requested_fields()
+    cities = [city.to_dict(fields=fields) for city in state.cities]
     response = jsonify(cities)
 
     return response
 
 
+@app_views.route("/cities", strict_slashes=False)
+@conditional(City)
+@cached(City)
+def get_cities():
+    """Returns the cities listed by the ids parameter"""
+    found = by_ids(City)
+    if found is None:
+        return abort(400, "Missing ids")
+    return found
+
+
 @app_views.route("/cities/<city_id>", strict_slashes=False)
 def get_city(city_id):
     """Returns a specific city based on city_id"""
@@ -27,9 +50,7 @@ def get_city(city_id):
     if not city:
         return abort(404)
 
-    response = jsonify(city.to_dict())
-
-    return response
+    return object_response(city)
 
 
 @app_views.route("/cities/city_id", strict_slashes=False)
@@ -80,7 +101,8 @@ def update_city(city_id):
         if not payload:
             return abort(404, "Not a JSON")
 
-        default_attrs = ['id', 'state_id', 'created_at', 'updated_at']
+        default_attrs = ['id', 'state_id', 'created_at', 'updated_at',
+                         'places']
 
         for k, v in payload.items():
             if k not in default_attrs:
@@ -15,11 +15,12 @@ def api_status():
 @app_views.route('/stats')
 def api_stats():
     """Retrieves the number of each objects by type"""
-    response = {"amenities": storage.count('Amenity'),
-                "cities": storage.count('City'),
-                "places": storage.count('Place'),
-                "reviews": storage.count('Review'),
-                "states": storage.count('State'),
-                "users": storage.count('User')}
+    counts = storage.counts()
+    response = {"amenities": counts.get('Amenity', 0),
+                "cities": counts.get('City', 0),
+                "places": counts.get('Place', 0),
+                "reviews": counts.get('Review', 0),
+                "states": counts.get('State', 0),
+                "users": counts.get('User', 0)}
 
     return jsonify(response)
@@ -8,28 +8,51 @@ from models.state import State
 from models.city import City
 from models.place import Place
 from api.v1.views import app_views
+from api.v1.pagination import iterate, paginate
+from api.v1.streaming import stream_list
+from api.v1.cache import cached
+from api.v1.lookup import by_ids
+from api.v1.fields import requested_fields
+from api.v1.conditional import conditional, object_response
 
 
 @app_views.route("/cities/<city_id>/places", strict_slashes=False)
+@conditional(Place, parent=(City, "city_id"))
+@cached(Place, parent=(City, "city_id"))
 def get_places_in_city(city_id):
     """Return the full list of places in a city"""
-    city = storage.get(City, city_id)
+    city = storage.get(City, city_id, eager=("places",))
 
     if city:
-        places = [place.to_dict() for place in city.places]
+        page = paginate(Place, city_id=city_id)
+        if page is not None:
+            return page
+        fields = requested_fields()
+        places = [place.to_dict(fields=fields) for place in city.places]
         response = jsonify(places)
         return response
     else:
         return abort(404)
 
 
+@app_views.route("/places", strict_slashes=False)
+@conditional(Place)
+@cached(Place)
+def get_places():
+    """Returns the places listed by the ids parameter"""
+    found = by_ids(Place)
+    if found is None:
+        return abort(400, "Missing ids")
+    return found
+
+
 @app_views.route("/places/<place_id>", strict_slashes=False)
 def get_specific_place(place_id):
     """Returns a specific place based on the given id"""
     place = storage.get(Place, place_id)
 
     if place:
-        return jsonify(place.to_dict())
+        return object_response(place)
     else:
         return abort(404)
 
@@ -93,7 +116,8 @@ def update_place(place_id):
     place = storage.get(Place, place_id)
     if not place:
         return abort(404)
-    ignore_keys = ['id', 'user_id', 'city_id', 'created_at', 'update_at']
+    ignore_keys = ['id', 'user_id', 'city_id', 'created_at', 'update_at',
+                   'reviews', 'amenities']
 
     for k, v in payload.items():
         if k not in ignore_keys:
@@ -112,62 +136,29 @@ def search_places():
         return abort(400, "Not a JSON")
 
     payload = request.get_json()
-    if not payload:
+    if not payload or not isinstance(payload, dict):
         return abort(400, "Not a JSON")
+    # the ids are looked up in sets, they must be hashable
+    for key in ('states', 'cities', 'amenities'):
+        ids = payload.get(key)
+        if ids is not None and (not isinstance(ids, list) or
+                                not all(isinstance(i, str) for i in ids)):
+            return abort(400, "Invalid " + key)
 
     state_filter = payload.get('states')
     city_filter = payload.get('cities')
     amenity_filter = payload.get('amenities')
 
-    # Return all places if no filter is given
+    fields = requested_fields()
+    # Stream every place straight from storage if no filter is given
     if not (state_filter or city_filter or amenity_filter):
-        places = storage.all(Place).values()
-        all_places = [place.to_dict() for place in places]
-        response = jsonify(all_places)
-
-        return response
-
-    # If atleast one filter is given, append the places in it to a set
-    all_places = []
-
-    if state_filter:
-        state_objs = [storage.get(State, st_id) for st_id in state_filter]
-        for state in state_objs:
-            if state:
-                for city in state.cities:
-                    if city:
-                        for ind, place in enumerate(city.places):
-                            if place not in all_places:
-                                all_places.append(place)
-
-    if city_filter:
-        city_objs = [storage.get(City, city_id) for city_id in city_filter]
-
-        for city in city_objs:
-            if city:
-                for place in city.places:
-                    if place not in all_places:
-                        all_places.append(place)
-
-    """
-    Use the amenities provide to filter all places only when there
-    is no places retrieved using the city-states and also when
-    the amenities filter are provided simulataneously. Otherwise
-    we won't retrieve anything.
-    """
-    if amenity_filter and not all_places:
-        places = storage.all(Place).values()
-        amn_objs = [storage.get(Amenity, amn_id) for amn_id in amenity_filter]
-        for place in places:
-            if all(amn in place.amenities for amn in amn_objs):
-                all_places.update(place.to_dict())
-
-    # Convert the places to dict and remove the list of amenities from it.
-    final_places = []
-    for place in all_places:
-        place_dict = place.to_dict()
-        place_dict.pop('amenities', None)
-        final_places.append(place_dict)
-    response = jsonify(final_places)
-
-    return response
+        places = iterate(Place, fields=fields)
+    else:
+        places = storage.search_places(states=state_filter,
+                                       cities=city_filter,
+                                       amenities=amenity_filter)
+
+    # Remove the list of amenities from the dict of every place.
+    return stream_list(places,
+                       transform=lambda place: place.pop('amenities', None),
+                       fields=fields)
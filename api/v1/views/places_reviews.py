@@ -7,28 +7,50 @@ from models.user import User
 from models.place import Place
 from models.place import Place
 from api.v1.views import app_views
+from api.v1.pagination import paginate
+from api.v1.cache import cached
+from api.v1.lookup import by_ids
+from api.v1.fields import requested_fields
+from api.v1.conditional import conditional, object_response
 
 
 @app_views.route("/places/<place_id>/reviews", strict_slashes=False)
+@conditional(Review, parent=(Place, "place_id"))
+@cached(Review, parent=(Place, "place_id"))
 def get_place_reviews(place_id):
     """Return the full list of reviews in a place"""
-    places = storage.get(Place, place_id)
+    places = storage.get(Place, place_id, eager=("reviews",))
 
     if places:
-        reviews = [review.to_dict() for review in places.reviews]
+        page = paginate(Review, place_id=place_id)
+        if page is not None:
+            return page
+        fields = requested_fields()
+        reviews = [review.to_dict(fields=fields) for review in places.reviews]
         response = jsonify(reviews)
         return response
     else:
         return abort(404)
 
 
+@app_views.route("/reviews", strict_slashes=False)
+@conditional(Review)
+@cached(Review)
+def get_reviews():
+    """Returns the reviews listed by the ids parameter"""
+    found = by_ids(Review)
+    if found is None:
+        return abort(400, "Missing ids")
+    return found
+
+
 @app_views.route("/reviews/<review_id>", strict_slashes=False)
 def get_specific_review(review_id):
     """Returns a specific review based on the given id"""
     review = storage.get(Review, review_id)
 
     if review:
-        return jsonify(review.to_dict())
+        return object_response(review)
     else:
         return abort(404)
 
@@ -4,13 +4,27 @@ from api.v1.views import app_views
 from models import storage
 from flask import jsonify, request, abort
 from models.state import State
+from api.v1.pagination import paginate
+from api.v1.cache import cached
+from api.v1.lookup import by_ids
+from api.v1.fields import requested_fields
+from api.v1.conditional import conditional, object_response
 
 
 @app_views.route('/states', strict_slashes=False)
+@conditional(State)
+@cached(State)
 def get_all_states():
     """Returns all states in our database"""
-    states = storage.all(State)
-    state_list = [state.to_dict() for state in states.values()]
+    found = by_ids(State)
+    if found is not None:
+        return found
+    page = paginate(State)
+    if page is not None:
+        return page
+    fields = requested_fields()
+    states = storage.all(State, fields=fields)
+    state_list = [state.to_dict(fields=fields) for state in states.values()]
     response = jsonify(state_list)
 
     return response
@@ -21,8 +35,7 @@ def get_specific_state(state_id):
     """Returns a specific state equivalent to state_id"""
     state = storage.get(State, state_id)
     if state:
-        response = jsonify(state.to_dict())
-        return response
+        return object_response(state)
     else:
         abort(404)
 
@@ -71,7 +84,7 @@ def update_state(state_id):
     if not state:
         return abort(404)
 
-    to_ignore = ['id', 'created_at', 'updated_at']
+    to_ignore = ['id', 'created_at', 'updated_at', 'cities']
 
     for key, val in state_prop.items():
         if key not in to_ignore:
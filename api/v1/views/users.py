@@ -5,17 +5,28 @@ from models import storage
 from models.state import State
 from models.user import User
 from api.v1.views import app_views
+from api.v1.pagination import iterate, paginate
+from api.v1.streaming import stream_list
+from api.v1.cache import cached
+from api.v1.lookup import by_ids
+from api.v1.fields import requested_fields
+from api.v1.conditional import conditional, object_response
 
 
 @app_views.route("/users", strict_slashes=False)
+@conditional(User)
+@cached(User)
 def get_users():
     """Return the full list of end users in a state"""
-    users = []
-    for k, v in storage.all(User).items():
-        users.append(v.to_dict())
-    response = jsonify(users)
+    found = by_ids(User)
+    if found is not None:
+        return found
+    page = paginate(User)
+    if page is not None:
+        return page
 
-    return response
+    fields = requested_fields()
+    return stream_list(iterate(User, fields=fields), fields=fields)
 
 
 @app_views.route("/users/<user_id>", strict_slashes=False)
@@ -24,7 +35,7 @@ def get_specific_user(user_id):
     user = storage.get(User, user_id)
 
     if user:
-        return jsonify(user.to_dict())
+        return object_response(user)
     else:
         return abort(404)
 
@@ -78,7 +89,8 @@ def update_user(user_id):
     user = storage.get(User, user_id)
     if not user:
         return abort(404)
-    ignore_keys = ['id', 'email', 'created_at', 'update_at']
+    ignore_keys = ['id', 'email', 'created_at', 'update_at', 'places',
+                   'reviews']
 
     for k, v in payload.items():
         if k not in ignore_keys:
@@ -0,0 +1,39 @@
+#!/usr/bin/python3
+"""
+Compares the installed JSON codecs on the records the storage writes
+and the lists the API sends.
+Usage: python3 -m benchmarks.bench_codec [number of objects]
+"""
+import sys
+import timeit
+from models import codec
+from models.place import Place
+
+
+def best(func):
+    """returns the best time in seconds of one call to func"""
+    return min(timeit.repeat(func, number=1, repeat=5))
+
+
+def main(n):
+    """runs the benchmark over n places"""
+    records = [Place(city_id="c", user_id="u", name="Place {}".format(i),
+                     description="A nice place " * 4, number_rooms=3,
+                     latitude=6.45, longitude=3.4).to_dict()
+               for i in range(n)]
+    lines = [codec.dumps(record) for record in records]
+    print("{:<8} {:>12} {:>12} {:>12}".format(
+        "codec", "dumps rec/s", "loads rec/s", "list MB/s"))
+    for name in codec.codecs:
+        codec.select(name)
+        dump = best(lambda: [codec.dumps(record) for record in records])
+        load = best(lambda: [codec.loads(line) for line in lines])
+        size = len(codec.dumps(records))
+        whole = best(lambda: codec.dumps(records, sort_keys=True))
+        print("{:<8} {:>12.0f} {:>12.0f} {:>12.1f}".format(
+            name, n / dump, n / load, size / whole / 1e6))
+    codec.select(codec.CODEC)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
@@ -0,0 +1,85 @@
+#!/usr/bin/python3
+"""
+Compares the JSON file and the binary snapshot of FileStorage on parse
+time, load time (parse and index) into an empty storage, save time when
+nothing changed and after one new object, and file size, leaving out
+fsync.
+Usage: python3 -m benchmarks.bench_snapshot [number of objects]
+"""
+import os
+import sys
+import tempfile
+import timeit
+from models.engine import snapshot
+from models.engine.file_storage import FileStorage, iter_items
+from models.place import Place
+from models.review import Review
+from models.user import User
+
+
+def best(func):
+    """returns the best time in seconds of one call to func"""
+    return min(timeit.repeat(func, number=1, repeat=5))
+
+
+def parse(path, fmt):
+    """returns the records read from path, written in the format fmt"""
+    if fmt == "binary":
+        with open(path, "rb") as f:
+            return list(snapshot.read(f))
+    with open(path, encoding="utf-8") as f:
+        return list(iter_items(f))
+
+
+def load(storage):
+    """reloads storage into empty object stores and indexes"""
+    for name in ("objects", "classes", "links", "linked", "created",
+                 "order"):
+        setattr(FileStorage, "_FileStorage__" + name, {})
+    storage.reload()
+
+
+def save_one(storage):
+    """saves storage after adding one object to it"""
+    storage.new(User(email="one@hbnb.io"))
+    storage.save()
+
+
+def use(path, fmt):
+    """points FileStorage to path, written in the format fmt"""
+    FileStorage._FileStorage__file_path = path
+    FileStorage._FileStorage__format = fmt
+
+
+def main(n):
+    """runs the benchmark over n objects of each of three classes"""
+    storage = FileStorage()
+    FileStorage._FileStorage__fsync = "never"
+    os.chdir(tempfile.mkdtemp())
+    use("bench.json", "json")
+    for i in range(n):
+        user = User(email="user{}@hbnb.io".format(i), first_name="Betty")
+        place = Place(city_id="c", user_id=user.id, name="Place {}".format(i),
+                      description="A nice place " * 4, number_rooms=3)
+        storage.new(user)
+        storage.new(place)
+        storage.new(Review(place_id=place.id, user_id=user.id,
+                           text="Great stay"))
+    storage.save()
+    print("{} objects".format(3 * n))
+    print("{:<8} {:>10} {:>10} {:>10} {:>10} {:>10}".format(
+        "format", "parse ms", "load ms", "save ms", "save 1 ms", "size KB"))
+    for path, fmt in (("bench.json", "json"), ("bench.bin", "binary")):
+        use(path, fmt)
+        storage.save()
+        read = best(lambda: parse(path, fmt))
+        loaded = best(lambda: load(storage))
+        save = best(storage.save)
+        one = best(lambda: save_one(storage))
+        print("{:<8} {:>10.1f} {:>10.1f} {:>10.1f} {:>10.1f} {:>10.0f}".
+              format(fmt, read * 1000, loaded * 1000, save * 1000,
+                     one * 1000, os.path.getsize(path) / 1024))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
@@ -0,0 +1,58 @@
+#!/usr/bin/python3
+"""
+Compares the timestamp codec of the models with strptime and strftime,
+then times loading and serializing many objects.
+Usage: python3 -m benchmarks.bench_timestamps [number of objects]
+"""
+from datetime import datetime, timedelta
+import sys
+import timeit
+from models.review import Review
+from models.timestamps import parse, stringify, time
+
+
+def best(func, number):
+    """returns the best time in seconds of number calls to func"""
+    return min(timeit.repeat(func, number=number, repeat=5))
+
+
+def report(label, before, after, number):
+    """prints the time per call of two ways of doing the same work"""
+    print("{:<24} {:>9.0f} ns {:>9.0f} ns {:>6.1f}x".format(
+        label, before / number * 1e9, after / number * 1e9, before / after))
+
+
+def main(n):
+    """runs the benchmark over n objects"""
+    start = datetime(2017, 9, 28, 21, 3, 54, 52298)
+    records = []
+    for i in range(n):
+        created = (start + timedelta(seconds=i)).strftime(time)
+        updated = (start + timedelta(seconds=i, microseconds=7)).\
+            strftime(time)
+        records.append({"__class__": "Review", "id": str(i),
+                        "created_at": created, "updated_at": updated,
+                        "place_id": "p", "user_id": "u", "text": "Nice"})
+    text, value = records[0]["created_at"], start
+    print("{:<24} {:>12} {:>12} {:>7}".format("", "before", "after",
+                                              "speedup"))
+    report("parse", best(lambda: datetime.strptime(text, time), 10000),
+           best(lambda: parse(text), 10000), 10000)
+    report("format", best(lambda: value.strftime(time), 10000),
+           best(lambda: stringify(value), 10000), 10000)
+    objs = [Review(**record) for record in records]
+    report("to_dict timestamps",
+           best(lambda: [(obj.created_at.strftime(time),
+                          obj.updated_at.strftime(time)) for obj in objs], 1),
+           best(lambda: [(obj.stamp("created_at"), obj.stamp("updated_at"))
+                         for obj in objs], 1), n)
+    load = best(lambda: [Review(**record) for record in records], 1)
+    dump = best(lambda: [obj.to_dict() for obj in objs], 1)
+    print("load {} objects: {:.1f} ms, {:.0f} objects/s".format(
+        n, load * 1000, n / load))
+    print("to_dict {} objects: {:.1f} ms, {:.0f} objects/s".format(
+        n, dump * 1000, n / dump))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
@@ -0,0 +1,14 @@
+#!/usr/bin/python3
+"""
+Converts a FileStorage JSON file to a binary snapshot, or back.
+Usage: ./convert_storage.py file.json file.bin
+       ./convert_storage.py file.bin file.json
+"""
+import sys
+from models.engine.snapshot import convert
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        sys.exit("Usage: {} <source> <destination>".format(sys.argv[0]))
+    print("wrote a {} to {}".format(convert(sys.argv[1], sys.argv[2]),
+                                    sys.argv[2]))
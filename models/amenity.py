@@ -14,7 +14,8 @@ class Amenity(BaseModel, Base):
         __tablename__ = 'amenities'
         name = Column(String(128), nullable=False)
     else:
-        name = ""
+        _defaults = {"name": ""}
+        __slots__ = tuple(_defaults)
 
     def __init__(self, *args, **kwargs):
         """initializes Amenity"""
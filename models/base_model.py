@@ -5,13 +5,27 @@ Contains class BaseModel
 
 from datetime import datetime
 import models
+from models import codec
+from models.spans import traced
+from models.timestamps import parse, stringify
 from os import getenv
+import sys
 import sqlalchemy
 from sqlalchemy import Column, String, DateTime
+from sqlalchemy.dialects import mysql
 from sqlalchemy.ext.declarative import declarative_base
 import uuid
 
-time = "%Y-%m-%dT%H:%M:%S.%f"
+# position of each timestamp in the _stamps of file-mode instances
+STAMPED = {"created_at": 0, "updated_at": 1}
+# keep the JSON and timestamps of every saved file-mode instance until
+# it changes, trading memory for faster compactions
+KEEP_JSON = getenv('HBNB_FILE_KEEP_JSON', '0') in ('1', 'true')
+# bookkeeping slots of file-mode instances, never serialized
+PRIVATE = ("_extra", "_stamps", "_encoded")
+
+# MySQL keeps whole seconds by default; versions need microseconds
+Timestamp = DateTime().with_variant(mysql.DATETIME(fsp=6), "mysql")
 
 if models.storage_t == "db":
     Base = declarative_base()
@@ -23,21 +37,47 @@ class BaseModel:
     """The BaseModel class from which future classes will be derived"""
     if models.storage_t == "db":
         id = Column(String(60), primary_key=True)
-        created_at = Column(DateTime, default=datetime.utcnow)
-        updated_at = Column(DateTime, default=datetime.utcnow)
+        created_at = Column(Timestamp, default=datetime.utcnow)
+        updated_at = Column(Timestamp, default=datetime.utcnow)
+    else:
+        # undeclared attributes live in _extra, created on first use,
+        # _stamps keeps created_at and updated_at once formatted and
+        # _encoded keeps the last to_json until the next change, if
+        # KEEP_JSON is set
+        __slots__ = ("id", "created_at", "updated_at") + PRIVATE
+        # the slots holding columns, the only ones setattr may write
+        _columns = frozenset(("id", "created_at", "updated_at"))
+        # values of the declared attributes that were never set
+        _defaults = {}
+
+        def __init_subclass__(cls, **kwargs):
+            """lists the column slots of a model"""
+            super().__init_subclass__(**kwargs)
+            cls._columns = cls._columns.union(cls.__dict__.get("__slots__",
+                                                               ()))
 
     def __init__(self, *args, **kwargs):
         """Initialization of the base model"""
+        if models.storage_t != "db":
+            # set, the bookkeeping slots are read without __getattr__
+            for name in PRIVATE:
+                object.__setattr__(self, name, None)
         if kwargs:
             for key, value in kwargs.items():
                 if key != "__class__":
                     setattr(self, key, value)
+            created = updated = None
             if kwargs.get("created_at", None) and type(self.created_at) is str:
-                self.created_at = datetime.strptime(kwargs["created_at"], time)
+                created = kwargs["created_at"]
+                self.created_at = parse(created)
             else:
                 self.created_at = datetime.utcnow()
             if kwargs.get("updated_at", None) and type(self.updated_at) is str:
-                self.updated_at = datetime.strptime(kwargs["updated_at"], time)
+                updated = kwargs["updated_at"]
+                if updated == created:
+                    self.updated_at = self.created_at
+                else:
+                    self.updated_at = parse(updated)
             else:
                 self.updated_at = datetime.utcnow()
             if kwargs.get("id", None) is None:
@@ -47,31 +87,141 @@ class BaseModel:
             self.created_at = datetime.utcnow()
             self.updated_at = self.created_at
 
+    if models.storage_t != "db":
+        def __setattr__(self, name, value):
+            """sets an attribute, reindexing it in storage if it is a key"""
+            if name.endswith("_id") and type(value) is str:
+                # many objects point to the same parent, share its id
+                value = sys.intern(value)
+            # the bookkeeping slots, _defaults and properties can only be
+            # set as extra attributes
+            if name in self._columns:
+                object.__setattr__(self, name, value)
+            else:
+                if self._extra is None:
+                    object.__setattr__(self, "_extra", {})
+                self._extra[name] = value
+            self._changed()
+            if name.endswith(("_id", "_ids")):
+                models.storage.reindex(self)
+            elif name in STAMPED and self._stamps is not None:
+                self._stamps[STAMPED[name]] = None
+
+        def __getattr__(self, name):
+            """returns an undeclared attribute, or a declared one's default"""
+            if name in PRIVATE:
+                return None
+            if self._extra is not None and name in self._extra:
+                return self._extra[name]
+            if name in self._defaults:
+                value = self._defaults[name]
+                if type(value) is list:
+                    # never hand out the list shared by every instance
+                    value = list(value)
+                    object.__setattr__(self, name, value)
+                    self._changed()
+                return value
+            raise AttributeError("'{}' object has no attribute '{}'".format(
+                self.__class__.__name__, name))
+
+        def __delattr__(self, name):
+            """deletes an attribute, declared or not"""
+            if self._extra is not None and name in self._extra:
+                del self._extra[name]
+            else:
+                object.__delattr__(self, name)
+            self._changed()
+
+        def _changed(self):
+            """forgets the JSON kept since the last change"""
+            if self._encoded is not None:
+                object.__setattr__(self, "_encoded", None)
+
+        @property
+        def __dict__(self):
+            """returns the attributes set on the instance, as a new dict"""
+            attrs = {}
+            for cls in reversed(type(self).__mro__):
+                for name in cls.__dict__.get("__slots__", ()):
+                    try:
+                        attrs[name] = object.__getattribute__(self, name)
+                    except AttributeError:
+                        pass
+            for name in PRIVATE:
+                attrs.pop(name, None)
+            if self._extra:
+                attrs.update(self._extra)
+            return attrs
+
     def __str__(self):
         """String representation of the BaseModel class"""
         return "[{:s}] ({:s}) {}".format(self.__class__.__name__, self.id,
                                          self.__dict__)
 
+    def stamp(self, name):
+        """returns created_at or updated_at, as named, formatted"""
+        if models.storage_t == "db":
+            return stringify(getattr(self, name))
+        stamps = self._stamps
+        if stamps is None:
+            stamps = [None, None]
+            object.__setattr__(self, "_stamps", stamps)
+        i = STAMPED[name]
+        if stamps[i] is None:
+            stamps[i] = stringify(getattr(self, name))
+        return stamps[i]
+
     def save(self):
         """updates the attribute 'updated_at' with the current datetime"""
         self.updated_at = datetime.utcnow()
         models.storage.new(self)
         models.storage.save()
 
-    def to_dict(self, save_to_disk=None):
-        """returns a dictionary containing all keys/values of the instance"""
-        new_dict = self.__dict__.copy()
+    @traced("BaseModel.to_dict")
+    def to_dict(self, save_to_disk=None, fields=None):
+        """
+        returns a dictionary containing all keys/values of the instance,
+        or only those named in fields when it is given
+        """
+        attrs = self.__dict__
+        if fields is None:
+            new_dict = attrs.copy()
+        else:
+            new_dict = {key: attrs[key] for key in fields if key in attrs}
         if "created_at" in new_dict:
-            new_dict["created_at"] = new_dict["created_at"].strftime(time)
+            new_dict["created_at"] = self.stamp("created_at")
         if "updated_at" in new_dict:
-            new_dict["updated_at"] = new_dict["updated_at"].strftime(time)
-        new_dict["__class__"] = self.__class__.__name__
+            new_dict["updated_at"] = self.stamp("updated_at")
+        if fields is None or "__class__" in fields:
+            new_dict["__class__"] = self.__class__.__name__
         if "_sa_instance_state" in new_dict:
             del new_dict["_sa_instance_state"]
         if not save_to_disk and 'password' in new_dict:
             del new_dict['password']
         return new_dict
 
+    def to_json(self):
+        """returns to_dict() encoded in JSON, as the storage writes it"""
+        if models.storage_t == "db":
+            return codec.dumps(self.to_dict())
+        if not KEEP_JSON:
+            # a save leaves nothing on the instance, not even the stamps
+            stamps = self._stamps
+            if stamps is not None:
+                stamps = list(stamps)
+            encoded = codec.dumps(self.to_dict())
+            object.__setattr__(self, "_stamps", stamps)
+            return encoded
+        encoded = self._encoded
+        if encoded is None:
+            new_dict = self.to_dict()
+            encoded = codec.dumps(new_dict)
+            # lists can change in place, unseen, so they are encoded again
+            if not any(isinstance(value, (list, dict))
+                       for value in new_dict.values()):
+                object.__setattr__(self, "_encoded", encoded)
+        return encoded
+
     def delete(self):
         """delete the current instance from the storage"""
         models.storage.delete(self)
@@ -18,9 +18,16 @@ class City(BaseModel, Base):
         name = Column(String(128), nullable=False)
         places = relationship("Place", backref="cities")
     else:
-        state_id = ""
-        name = ""
+        _defaults = {"state_id": "", "name": ""}
+        __slots__ = tuple(_defaults)
 
     def __init__(self, *args, **kwargs):
         """initializes city"""
         super().__init__(*args, **kwargs)
+
+    if models.storage_t != "db":
+        @property
+        def places(self):
+            """getter for list of place instances located in the city"""
+            from models.place import Place
+            return models.storage.related(Place, "city_id", self.id)
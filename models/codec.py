@@ -0,0 +1,121 @@
+#!/usr/bin/python3
+"""
+Contains the JSON codec shared by the storage engines and the API
+"""
+import json
+import math
+from os import getenv
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# codec to use: auto picks the fastest one installed
+CODEC = getenv('HBNB_JSON_CODEC', 'auto')
+
+# dictionary - dumps and loads functions of every codec, by name
+codecs = {}
+# list - codec names tried in this order by auto
+preferred = []
+
+
+def register(name, dumps, loads, fast=False):
+    """
+    makes a codec selectable by name; dumps is called with the object,
+    sort_keys, default and indent and returns a str, loads is given a
+    str or UTF-8 bytes. Fast codecs are preferred by auto.
+    """
+    codecs[name] = (dumps, loads)
+    if fast and name not in preferred:
+        preferred.insert(0, name)
+
+
+def json_dumps(obj, sort_keys=False, default=None, indent=None):
+    """encodes obj with the standard library"""
+    return json.dumps(obj, sort_keys=sort_keys, default=default,
+                      indent=indent)
+
+
+register("json", json_dumps, json.loads)
+preferred.append("json")
+
+
+def finite(obj):
+    """tells whether obj holds no NaN or infinite float"""
+    if isinstance(obj, float):
+        return math.isfinite(obj)
+    if isinstance(obj, dict):
+        return all(finite(value) for value in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return all(finite(value) for value in obj)
+    return True
+
+
+if orjson is not None:
+    # let default see what json.dumps would also give to it
+    ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | \
+        orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS | \
+        orjson.OPT_PASSTHROUGH_SUBCLASS
+
+    def orjson_dumps(obj, sort_keys=False, default=None, indent=None):
+        """encodes obj with orjson"""
+        if indent not in (None, 2):
+            raise TypeError("orjson only indents by 2")
+        option = ORJSON_OPTIONS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        text = orjson.dumps(obj, default=default, option=option)
+        # orjson writes NaN and infinities as null, json as NaN/Infinity
+        if b"null" in text and not finite(obj):
+            return json_dumps(obj, sort_keys, default, indent)
+        return text.decode("utf-8")
+
+    register("orjson", orjson_dumps, orjson.loads, fast=True)
+
+
+name = None
+_dumps, _loads = codecs["json"]
+
+
+def select(wanted):
+    """
+    uses the codec named wanted, or the fastest one installed for auto
+    or an unknown name, and returns the name of the codec in use
+    """
+    global name, _dumps, _loads
+    if wanted not in codecs:
+        wanted = preferred[0]
+    name = wanted
+    _dumps, _loads = codecs[wanted]
+    return name
+
+
+def dumps(obj, sort_keys=False, default=None, indent=None):
+    """
+    returns obj encoded in JSON; what the codec in use cannot encode,
+    like integers over 64 bits, is encoded by the standard library
+    """
+    try:
+        return _dumps(obj, sort_keys, default, indent)
+    except (TypeError, OverflowError):
+        if _dumps is json_dumps:
+            raise
+        return json_dumps(obj, sort_keys, default, indent)
+
+
+def loads(text):
+    """
+    returns the object encoded in text, a str or UTF-8 bytes; what the
+    codec in use rejects, like NaN, is decoded by the standard library
+    """
+    try:
+        return _loads(text)
+    except ValueError:
+        if _loads is json.loads:
+            raise
+        return json.loads(text)
+
+
+select(CODEC)
@@ -9,16 +9,67 @@ from models.base_model import BaseModel, Base
 from models.city import City
 from models.place import Place
 from models.review import Review
+from models.spans import traced
 from models.state import State
+from models.timestamps import parse
 from models.user import User
 from os import getenv
 import sqlalchemy
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, distinct, event, func, literal, or_
+from sqlalchemy import and_, select, union_all
+from sqlalchemy.exc import TimeoutError as PoolTimeout
 from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy.orm import joinedload, load_only, selectinload, subqueryload
+from sqlalchemy.pool import QueuePool
+import threading
+import time
 
 classes = {"Amenity": Amenity, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
 
+loaders = {"joined": joinedload, "selectin": selectinload,
+           "subquery": subqueryload}
+
+
+def collect_touched(session, context):
+    """
+    after each flush, remembers every object the flush added, changed or
+    deleted, including those reached by cascades, until the commit
+    """
+    touched = session.info.setdefault("touched", [])
+    touched.extend(session.new)
+    touched.extend(session.dirty)
+    touched.extend(session.deleted)
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how often and how long checkouts wait"""
+
+    def __init__(self, *args, **kwargs):
+        """Instantiate the pool with empty checkout statistics"""
+        super().__init__(*args, **kwargs)
+        self.__lock = threading.Lock()
+        self.stats = {"checkouts": 0, "timeouts": 0,
+                      "wait_seconds": 0.0, "max_wait_seconds": 0.0}
+
+    def _do_get(self):
+        """checks a connection out, timing the wait for a free one"""
+        start = time.monotonic()
+        timed_out = False
+        try:
+            return super()._do_get()
+        except PoolTimeout:
+            timed_out = True
+            raise
+        finally:
+            waited = time.monotonic() - start
+            with self.__lock:
+                self.stats["checkouts"] += 1
+                self.stats["timeouts"] += timed_out
+                self.stats["wait_seconds"] += waited
+                if waited > self.stats["max_wait_seconds"]:
+                    self.stats["max_wait_seconds"] = waited
+
 
 class DBStorage:
     """interaacts with the MySQL database"""
@@ -32,42 +83,102 @@ class DBStorage:
         HBNB_MYSQL_HOST = getenv('HBNB_MYSQL_HOST')
         HBNB_MYSQL_DB = getenv('HBNB_MYSQL_DB')
         HBNB_ENV = getenv('HBNB_ENV')
-        self.__engine = create_engine('mysql+mysqldb://{}:{}@{}/{}'.
-                                      format(HBNB_MYSQL_USER,
-                                             HBNB_MYSQL_PWD,
-                                             HBNB_MYSQL_HOST,
-                                             HBNB_MYSQL_DB))
+        url = getenv('HBNB_MYSQL_URL') or 'mysql+mysqldb://{}:{}@{}/{}'.\
+            format(HBNB_MYSQL_USER, HBNB_MYSQL_PWD,
+                   HBNB_MYSQL_HOST, HBNB_MYSQL_DB)
+        self.__engine = create_engine(
+            url, poolclass=TimedQueuePool,
+            pool_size=int(getenv('HBNB_MYSQL_POOL_SIZE', 5)),
+            max_overflow=int(getenv('HBNB_MYSQL_MAX_OVERFLOW', 10)),
+            pool_timeout=float(getenv('HBNB_MYSQL_POOL_TIMEOUT', 30)),
+            pool_recycle=int(getenv('HBNB_MYSQL_POOL_RECYCLE', 3600)),
+            pool_pre_ping=getenv('HBNB_MYSQL_POOL_PRE_PING', '1') in
+            ('1', 'true'))
+        self.__strategy = getenv('HBNB_EAGER_STRATEGY', 'selectin')
+        self.__listeners = []
+        self.__chunk = int(getenv('HBNB_MYSQL_IN_CHUNK', 500))
         if HBNB_ENV == "test":
             Base.metadata.drop_all(self.__engine)
 
-    def all(self, cls=None):
-        """query on the current database session"""
+    def _eager(self, cls, eager, strategy=None, fields=None):
+        """
+        builds loader options for dotted relationship paths of cls, and
+        one loading only the columns of cls named in fields
+        """
+        loader = loaders[strategy or self.__strategy]
+        options = []
+        if fields is not None:
+            columns = cls.__table__.columns
+            options.append(load_only(*[getattr(cls, name) for name in fields
+                                       if name in columns] or [cls.id]))
+        for path in eager or ():
+            option, owner = None, cls
+            for name in path.split('.'):
+                attr = getattr(owner, name)
+                if option is None:
+                    option = loader(attr)
+                else:
+                    option = getattr(option, loader.__name__)(attr)
+                owner = attr.property.mapper.class_
+            options.append(option)
+        return options
+
+    @traced("DBStorage.all")
+    def all(self, cls=None, eager=None, strategy=None, fields=None):
+        """
+        query on the current database session, loading the relationship
+        paths in eager (e.g. "cities.places") with the given strategy and
+        only the columns in fields when it is given
+        """
         new_dict = {}
         for clss in classes:
-            if cls is None or cls is classes[clss] or cls is clss:
-                objs = self.__session.query(classes[clss]).all()
+            if cls is None or cls is classes[clss] or cls == clss:
+                options = self._eager(classes[clss], eager, strategy,
+                                      fields)
+                objs = self.__session.query(classes[clss]).\
+                    options(*options).all()
                 for obj in objs:
                     key = obj.__class__.__name__ + '.' + obj.id
                     new_dict[key] = obj
         return (new_dict)
 
+    @traced("DBStorage.new")
     def new(self, obj):
         """add the object to the current database session"""
         self.__session.add(obj)
 
+    @traced("DBStorage.save")
     def save(self):
-        """commit all changes of the current database session"""
-        self.__session.commit()
+        """
+        commit all changes of the current database session, then tell
+        the listeners about every object added, changed or deleted
+        """
+        try:
+            self.__session.commit()
+        finally:
+            touched = self.__session.info.pop("touched", [])
+        for obj in touched:
+            for listener in self.__listeners:
+                listener(obj)
 
+    @traced("DBStorage.delete")
     def delete(self, obj=None):
         """delete from the current database session obj if not None"""
         if obj is not None:
             self.__session.delete(obj)
 
+    def subscribe(self, listener):
+        """
+        registers listener to be called with every object added, changed
+        or deleted, once the change is committed
+        """
+        self.__listeners.append(listener)
+
     def reload(self):
         """reloads data from the database"""
         Base.metadata.create_all(self.__engine)
         sess_factory = sessionmaker(bind=self.__engine, expire_on_commit=False)
+        event.listen(sess_factory, "after_flush", collect_touched)
         Session = scoped_session(sess_factory)
         self.__session = Session
 
@@ -75,38 +186,118 @@ class DBStorage:
         """call remove() method on the private session attribute"""
         self.__session.remove()
 
-    def get(self, cls, id):
-        """Retrieves the object of a specific class, otherwise all objects"""
-        if cls and id:
-            if cls in classes.values() and isinstance(id, str):
-                specific_obj = self.all(cls)
-                for v in specific_obj.values():
-                    if v.id == id:
-                        return v
-            else:
-                return
-        else:
-            return
+    @traced("DBStorage.get")
+    def get(self, cls, id, eager=None, strategy=None, fields=None):
+        """Retrieves the object of a class by its primary key, or None"""
+        if isinstance(cls, str):
+            cls = classes.get(cls)
+        if cls not in classes.values() or not isinstance(id, str):
+            return None
+        return self.__session.get(
+            cls, id, options=self._eager(cls, eager, strategy, fields))
 
-    def count(self, cls=None):
+    @traced("DBStorage.get_many")
+    def get_many(self, cls, ids, eager=None, strategy=None, fields=None):
+        """
+        Retrieves the objects of a class with the given ids, in the order
+        of ids and skipping unknown ones, with one IN query per chunk
         """
-            Counts the number of occurence of an object
-        values = classes.values()
-        values_str = [str(value) for value in list(values)]
-
-        if (cls not in values) or (cls not in values_str):
-            return
-        elif (cls in values) or (cls in values_str):
-            return len(self.all(cls))
-        else:
-            return len(self.all())
-        """
-        if not cls:
-            all_ = self.all()
-            return len(all_)
-        for class_, value in classes.items():
-            if cls == class_ or cls == value:
-                everything = self.all(cls)
-                return len(everything)
+        if isinstance(cls, str):
+            cls = classes.get(cls)
+        if cls not in classes.values():
+            return []
+        ids = list(dict.fromkeys(id for id in ids if isinstance(id, str)))
+        options = self._eager(cls, eager, strategy, fields)
+        found = {}
+        for start in range(0, len(ids), self.__chunk):
+            query = select(cls).where(
+                cls.id.in_(ids[start:start + self.__chunk])).options(*options)
+            for obj in self.__session.execute(query).scalars():
+                found[obj.id] = obj
+        return [found[id] for id in ids if id in found]
+
+    @traced("DBStorage.count")
+    def count(self, cls=None):
+        """Counts the rows of a class, or of every class when none is given"""
+        if cls is None:
+            return sum(self.counts().values())
+        if isinstance(cls, str):
+            cls = classes.get(cls)
         if cls not in classes.values():
-            return
+            return None
+        query = select(func.count()).select_from(cls)
+        return self.__session.execute(query).scalar()
+
+    def pool_stats(self):
+        """returns the size, usage and checkout waits of the pool"""
+        pool = self.__engine.pool
+        stats = {"size": pool.size(), "checked_out": pool.checkedout(),
+                 "overflow": pool.overflow()}
+        stats.update(getattr(pool, "stats", {}))
+        return stats
+
+    @traced("DBStorage.counts")
+    def counts(self):
+        """returns the number of rows of every class in a single query"""
+        query = union_all(*[select(literal(name), func.count())
+                            .select_from(clss)
+                            for name, clss in classes.items()])
+        return {name: count for name, count in self.__session.execute(query)}
+
+    @traced("DBStorage.search_places")
+    def search_places(self, states=None, cities=None, amenities=None):
+        """
+        returns the places located in the given states or cities (all
+        places when neither is given) that have every given amenity,
+        ordered by creation date then id
+        """
+        from models.place import place_amenity
+        query = self.__session.query(Place)
+        if states or cities:
+            state_cities = select(City.id).where(
+                City.state_id.in_(states or []))
+            query = query.filter(or_(Place.city_id.in_(cities or []),
+                                     Place.city_id.in_(state_cities)))
+        if amenities:
+            amenities = set(amenities)
+            having = select(place_amenity.c.place_id).where(
+                place_amenity.c.amenity_id.in_(amenities)).group_by(
+                place_amenity.c.place_id).having(
+                func.count(distinct(place_amenity.c.amenity_id)) ==
+                len(amenities))
+            query = query.filter(Place.id.in_(having))
+        return query.order_by(Place.created_at, Place.id).all()
+
+    @traced("DBStorage.page")
+    def page(self, cls, limit, after=None, fields=None, **where):
+        """
+        returns up to limit objects of cls ordered by creation date then
+        id, following the (created_at, id) pair after when it is given and
+        keeping only objects whose foreign keys match where
+        """
+        if isinstance(cls, str):
+            cls = classes.get(cls)
+        query = self.__session.query(cls).filter_by(**where)
+        if fields is not None:
+            # the next cursor is built from created_at
+            query = query.options(*self._eager(
+                cls, None, fields=("created_at",) + tuple(fields)))
+        if after is not None:
+            created = parse(after[0])
+            query = query.filter(or_(cls.created_at > created,
+                                     and_(cls.created_at == created,
+                                          cls.id > after[1])))
+        return query.order_by(cls.created_at, cls.id).limit(limit).all()
+
+    @traced("DBStorage.version")
+    def version(self, cls, **where):
+        """
+        returns a token that changes whenever a row of cls matching where
+        is added, removed or updated, and the latest update time
+        """
+        if isinstance(cls, str):
+            cls = classes.get(cls)
+        query = select(func.count(), func.max(cls.updated_at)).where(
+            *[getattr(cls, attr) == value for attr, value in where.items()])
+        count, modified = self.__session.execute(query).one()
+        return "{}-{}".format(count, modified), modified
@@ -3,94 +3,621 @@
 Contains the FileStorage class
 """
 
+import bisect
+from datetime import datetime
 import json
+from models import codec
 from models.amenity import Amenity
 from models.base_model import BaseModel
 from models.city import City
+from models.engine import snapshot
 from models.place import Place
 from models.review import Review
+from models.spans import traced
 from models.state import State
+from models.timestamps import stringify
 from models.user import User
+import os
+from os import getenv
+import threading
+import uuid
 
 classes = {"Amenity": Amenity, "BaseModel": BaseModel, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
 
 
+def iter_items(f, size=1 << 16):
+    """yields the key/value pairs of the JSON object in f one at a time"""
+    decoder = json.JSONDecoder()
+    buf, pos, expect = "", 0, "{"
+    while True:
+        while pos < len(buf) and buf[pos] in " \t\r\n":
+            pos += 1
+        if pos == len(buf):
+            buf, pos = f.read(size), 0
+            if not buf:
+                raise ValueError("unexpected end of JSON file")
+            continue
+        char = buf[pos]
+        if expect == "value" or (expect == "key" and char != "}"):
+            try:
+                item, pos = decoder.raw_decode(buf, pos)
+            except ValueError:
+                chunk = f.read(size)
+                if not chunk:
+                    raise
+                buf, pos = buf[pos:] + chunk, 0
+                continue
+            if expect == "key":
+                key, expect = item, ":"
+            else:
+                yield key, item
+                expect = ","
+        elif char == "}" and expect in ("key", ","):
+            return
+        elif char == expect:
+            pos += 1
+            expect = {"{": "key", ":": "value", ",": "key"}[char]
+        else:
+            raise ValueError("unexpected {!r} in JSON file".format(char))
+
+
 class FileStorage:
     """serializes instances to a JSON file & deserializes back to instances"""
 
-    # string - path to the JSON file
-    __file_path = "file.json"
+    # string - format snapshots are written in: json or binary
+    __format = getenv('HBNB_FILE_FORMAT', 'json')
+    # string - path to the JSON file, or to the binary snapshot
+    __file_path = "file.bin" if __format == 'binary' else "file.json"
     # dictionary - empty but will store all objects by <class name>.id
     __objects = {}
+    # dictionary - the same objects indexed by <class name>, then by key
+    __classes = {}
+    # dictionary - objects changed since the last save, None when deleted
+    __dirty = {}
+    # boolean - append changes to a journal instead of rewriting the file
+    __journal = getenv('HBNB_FILE_JOURNAL', '0') in ('1', 'true')
+    # integer - journal records that trigger a compaction into the file
+    __compact_after = int(getenv('HBNB_FILE_COMPACT_AFTER', 1000))
+    # integer - records currently in the journal
+    __journal_len = 0
+    # string - when writes reach the disk: always, batch or never
+    __fsync = getenv('HBNB_FILE_FSYNC', 'batch')
+    # integer - writes between two fsyncs in batch mode
+    __fsync_every = int(getenv('HBNB_FILE_FSYNC_BATCH', 10))
+    # integer - writes since the last fsync
+    __unsynced = 0
+    # tuple - attributes holding the id(s) of related objects
+    __foreign_keys = ("state_id", "city_id", "place_id", "user_id",
+                      "amenity_ids")
+    # dictionary - keys by <class name>, then foreign key, then its value
+    __links = {}
+    # dictionary - the (foreign key, value) pairs each key is linked by
+    __linked = {}
+    # dictionary - creation date of every key, as stored in the JSON file
+    __created = {}
+    # dictionary - (creation date, key) pairs sorted for each class name
+    __order = {}
+    # string - tells the versions of this process from those of others
+    __boot = str(uuid.uuid4())
+    # dictionary - change counter of every class name
+    __versions = {}
+    # dictionary - time of the last change of every class name
+    __modified = {}
+    # tuple - size and mtime of the JSON file and journal last seen
+    __signature = None
+    # list - callables told of every object added, changed or deleted
+    __listeners = []
+    # lock - held by the threads writing the file or its journal
+    __lock = threading.RLock()
+    # dictionary - class version and table entry of the snapshot sections
+    # on disk that still hold exactly the objects of their class
+    __sections = {}
 
-    def all(self, cls=None):
-        """returns the dictionary __objects"""
+    def _class_name(self, cls):
+        """returns the name of a known class given as a class or a string"""
+        if isinstance(cls, str):
+            return cls if cls in classes else None
+        if cls in classes.values():
+            return cls.__name__
+        return None
+
+    @traced("FileStorage.all")
+    def all(self, cls=None, eager=None, strategy=None, fields=None):
+        """
+        returns the dictionary __objects; eager, strategy and fields are
+        accepted for DBStorage compatibility, relationships here come from
+        indexes and objects are always whole
+        """
         if cls is not None:
-            new_dict = {}
-            for key, value in self.__objects.items():
-                if cls == value.__class__ or cls == value.__class__.__name__:
-                    new_dict[key] = value
-            return new_dict
+            name = self._class_name(cls)
+            objs = self.__classes.get(name, {})
+            return {key: self._hydrate(key, value)
+                    for key, value in objs.items()}
+        for key, value in self.__objects.items():
+            self._hydrate(key, value)
         return self.__objects
 
+    @traced("FileStorage.new")
     def new(self, obj):
         """sets in __objects the obj with key <obj class name>.id"""
         if obj is not None:
-            key = obj.__class__.__name__ + "." + obj.id
+            name = obj.__class__.__name__
+            key = name + "." + obj.id
             self.__objects[key] = obj
+            self.__classes.setdefault(name, {})[key] = obj
+            self.__dirty[key] = obj
+            self._link(key, obj)
+            self._track(key, obj.stamp("created_at"))
+            self._touch(name)
+            self._notify(obj)
 
+    @traced("FileStorage.save")
     def save(self):
         """serializes __objects to the JSON file (path: __file_path)"""
-        json_objects = {}
-        for key in self.__objects:
-            json_objects[key] = self.__objects[key].to_dict()
-        with open(self.__file_path, 'w') as f:
-            json.dump(json_objects, f)
+        with self.__lock:
+            pending = FileStorage.__journal_len + len(self.__dirty)
+            # a journal only means something next to its snapshot
+            if not self.__journal or pending > self.__compact_after or \
+                    not os.path.exists(self.__file_path):
+                self.compact()
+                return
+            with open(self.__file_path + '.journal', 'a',
+                      encoding='utf-8') as f:
+                for key, obj in list(self.__dirty.items()):
+                    record = obj.to_json() if obj is not None else "null"
+                    f.write('{"key": ' + codec.dumps(key) + ', "value": ' +
+                            record + '}\n')
+                self._sync(f)
+            FileStorage.__journal_len += len(self.__dirty)
+            FileStorage.__signature = self._on_disk()
+            self.__dirty.clear()
+
+    @traced("FileStorage.compact")
+    def compact(self):
+        """writes every object to the snapshot and empties the journal"""
+        with self.__lock:
+            self._compact()
+
+    def _compact(self):
+        """writes the snapshot and empties the journal, under the lock"""
+        # a temporary file of its own, next to the file it will replace
+        tmp_path = "{}.{}.tmp".format(self.__file_path, uuid.uuid4().hex)
+        try:
+            if self.__format == 'binary':
+                sections = self._sections()
+                with open(tmp_path, 'xb') as f:
+                    table = snapshot.write(f, sections)
+                    self._sync(f)
+            else:
+                with open(tmp_path, 'x', encoding='utf-8') as f:
+                    sep = "{"
+                    for key, value in list(self.__objects.items()):
+                        if type(value) is dict:
+                            value = codec.dumps(value)
+                        else:
+                            value = value.to_json()
+                        f.write(sep + codec.dumps(key) + ": " + value)
+                        sep = ", "
+                    f.write("}" if sep == ", " else "{}")
+                    self._sync(f)
+            os.replace(tmp_path, self.__file_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        if self.__format == 'binary':
+            FileStorage.__sections = {
+                entry[0]: (self.__versions.get(entry[0]), entry)
+                for entry in table}
+        else:
+            FileStorage.__sections = {}
+        if self.__fsync == 'always':
+            self._sync_dir()
+        if os.path.exists(self.__file_path + '.journal'):
+            os.remove(self.__file_path + '.journal')
+        FileStorage.__journal_len = 0
+        FileStorage.__signature = self._on_disk()
+        self.__dirty.clear()
+
+    def _sections(self):
+        """
+        returns the record count and packed section of every class for a
+        snapshot, copied from the snapshot on disk for the classes that
+        did not change since and whose objects were never built
+        """
+        sections, unchanged = {}, {}
+        if FileStorage.__signature == self._on_disk():
+            for name, (version, entry) in self.__sections.items():
+                objs = self.__classes.get(name)
+                # built objects can be changed in place, unseen
+                if objs and version == self.__versions.get(name) and \
+                        all(type(value) is dict for value in objs.values()):
+                    unchanged[name] = entry
+        if unchanged:
+            try:
+                with open(self.__file_path, 'rb') as f:
+                    for name, entry in unchanged.items():
+                        sections[name] = (entry[1], snapshot.packed(f, entry))
+            except (OSError, ValueError):
+                sections.clear()
+        for name, objs in self.__classes.items():
+            if objs and name not in sections:
+                sections[name] = (len(objs), self._pack(name, objs))
+        return sections
 
+    def _pack(self, name, objs):
+        """returns the packed section of objs, the objects of class name"""
+        return snapshot.pack(
+            {key: value if type(value) is dict else value.to_dict()
+             for key, value in objs.items()},
+            created={key: self.__created[key] for key in objs
+                     if key in self.__created},
+            links=self.__links.get(name, {}),
+            linked={key: self.__linked[key] for key in objs
+                    if key in self.__linked})
+
+    def _sync(self, f):
+        """flushes f and fsyncs it when the fsync policy asks for it"""
+        f.flush()
+        FileStorage.__unsynced += 1
+        if self.__fsync == 'batch':
+            due = FileStorage.__unsynced >= self.__fsync_every
+        else:
+            due = self.__fsync == 'always'
+        if due:
+            os.fsync(f.fileno())
+            FileStorage.__unsynced = 0
+
+    def _sync_dir(self):
+        """fsyncs the directory holding the JSON file so renames persist"""
+        if os.name != 'posix':
+            return
+        fd = os.open(os.path.dirname(os.path.abspath(self.__file_path)),
+                     os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    @traced("FileStorage.reload")
     def reload(self):
-        """deserializes the JSON file to __objects"""
+        """deserializes the JSON file or snapshot, then replays its journal"""
+        FileStorage.__signature = self._on_disk()
+        FileStorage.__sections = {}
         try:
-            with open(self.__file_path, 'r') as f:
-                jo = json.load(f)
-            for key in jo:
-                self.__objects[key] = classes[jo[key]["__class__"]](**jo[key])
+            if snapshot.is_snapshot(self.__file_path):
+                with open(self.__file_path, 'rb') as f:
+                    table = {entry[0]: entry for entry in snapshot.sections(f)}
+                    for name, section in snapshot.read_sections(f):
+                        if self._load_section(name, section):
+                            FileStorage.__sections[name] = (
+                                self.__versions.get(name), table[name])
+            else:
+                with open(self.__file_path, 'r', encoding='utf-8') as f:
+                    for key, record in iter_items(f):
+                        self._load(key, record)
         except Exception:
             pass
+        self._notify(None)
+        FileStorage.__journal_len = 0
+        journal = self.__file_path + '.journal'
+        if not os.path.exists(journal):
+            return
+        if not os.path.exists(self.__file_path) or \
+                os.stat(self.__file_path).st_mtime_ns > \
+                os.stat(journal).st_mtime_ns:
+            # left behind by a compaction or a removed snapshot: its
+            # records are older than the snapshot, or belong to another
+            os.remove(journal)
+            return
+        size = 0
+        with open(journal, 'rb') as f:
+            for line in f:
+                try:
+                    entry = codec.loads(line)
+                except ValueError:
+                    break
+                if not line.endswith(b"\n"):
+                    break
+                self._load(entry["key"], entry["value"])
+                FileStorage.__journal_len += 1
+                size += len(line)
+        if size < os.path.getsize(journal):
+            # drop the partial record left behind by an interrupted save
+            with open(journal, 'r+b') as f:
+                f.truncate(size)
 
+    def _load(self, key, record):
+        """puts the raw record under key until it is used, or drops key"""
+        name = key.split('.')[0]
+        self._touch(name)
+        self.__objects.pop(key, None)
+        self.__classes.get(name, {}).pop(key, None)
+        self._unlink(key)
+        if record is not None:
+            self.__objects[key] = record
+            self.__classes.setdefault(name, {})[key] = record
+            self._link(key, record)
+            self._track(key, record.get("created_at"))
+        else:
+            self._untrack(key)
+
+    def _load_section(self, name, section):
+        """
+        puts the raw records of a snapshot section of the class called name
+        under their keys, and tells whether they are all its objects
+        """
+        self._touch(name)
+        objects = section["objects"]
+        objs = self.__classes.setdefault(name, {})
+        if objs or "linked" not in section:
+            for key, record in objects.items():
+                if key in self.__objects:
+                    self._load(key, record)
+                    continue
+                self.__objects[key] = record
+                objs[key] = record
+                self._link(key, record)
+                self._track(key, record.get("created_at"))
+            return False
+        # a class loaded first takes the indexes saved with its records
+        objs.update(objects)
+        self.__objects.update(objects)
+        self.__created.update(section["created"])
+        self.__linked.update(section["linked"])
+        links = self.__links.setdefault(name, {})
+        for attr, by_value in section["links"].items():
+            known = links.setdefault(attr, {})
+            for value, keys in by_value.items():
+                if value in known:
+                    known[value].update(keys)
+                else:
+                    known[value] = keys
+        self.__order.pop(name, None)
+        return True
+
+    def _hydrate(self, key, value):
+        """returns the object for a stored value, building it from a record"""
+        if type(value) is dict:
+            value = classes[value["__class__"]](**value)
+            self.__objects[key] = value
+            self.__classes[key.split('.')[0]][key] = value
+        return value
+
+    @traced("FileStorage.delete")
     def delete(self, obj=None):
         """delete obj from __objects if it’s inside"""
         if obj is not None:
-            key = obj.__class__.__name__ + '.' + obj.id
+            name = obj.__class__.__name__
+            key = name + '.' + obj.id
             if key in self.__objects:
                 del self.__objects[key]
+            self.__classes.get(name, {}).pop(key, None)
+            self.__dirty[key] = None
+            self._unlink(key)
+            self._untrack(key)
+            self._touch(name)
+            self._notify(obj)
+
+    def _link(self, key, value):
+        """indexes the stored value under key by its foreign keys"""
+        self._unlink(key)
+        links = self.__links.setdefault(key.split('.')[0], {})
+        pairs = []
+        for attr in self.__foreign_keys:
+            if type(value) is dict:
+                found = value.get(attr)
+            else:
+                # skip __getattr__, it would give a Place its own
+                # amenity_ids list just for being indexed
+                try:
+                    found = object.__getattribute__(value, attr)
+                except AttributeError:
+                    found = (getattr(value, "_extra", None) or {}).get(attr)
+            for fk in found if isinstance(found, list) else [found]:
+                if fk and isinstance(fk, str):
+                    links.setdefault(attr, {}).setdefault(fk, {})[key] = None
+                    pairs.append((attr, fk))
+        if pairs:
+            self.__linked[key] = pairs
+
+    def _unlink(self, key):
+        """removes key from the foreign key indexes"""
+        pairs = self.__linked.pop(key, None)
+        if not pairs:
+            return
+        links = self.__links.get(key.split('.')[0], {})
+        for attr, fk in pairs:
+            keys = links.get(attr, {}).get(fk, {})
+            keys.pop(key, None)
+            if not keys:
+                links.get(attr, {}).pop(fk, None)
+
+    def _track(self, key, created):
+        """records the creation date of key for ordered pages"""
+        if not isinstance(created, str):
+            created = stringify(created) if created else ""
+        if self.__created.get(key) == created:
+            return
+        self._untrack(key)
+        self.__created[key] = created
+        order = self.__order.get(key.split('.')[0])
+        if order is not None:
+            bisect.insort(order, (created, key))
+
+    def _untrack(self, key):
+        """forgets the creation date of key"""
+        created = self.__created.pop(key, None)
+        order = self.__order.get(key.split('.')[0])
+        if created is None or order is None:
+            return
+        i = bisect.bisect_left(order, (created, key))
+        if i < len(order) and order[i] == (created, key):
+            del order[i]
+
+    def reindex(self, obj):
+        """updates the foreign key indexes after obj was changed in place"""
+        key = obj.__class__.__name__ + "." + str(getattr(obj, "id", ""))
+        if self.__objects.get(key) is obj:
+            self._link(key, obj)
+
+    @traced("FileStorage.related")
+    def related(self, cls, attr, value):
+        """returns the objects of cls whose foreign key attr equals value"""
+        name = self._class_name(cls)
+        objs = self.__classes.get(name, {})
+        keys = self.__links.get(name, {}).get(attr, {}).get(value, {})
+        return [self._hydrate(key, objs[key]) for key in list(keys)
+                if key in objs]
 
     def close(self):
-        """call reload() method for deserializing the JSON file to objects"""
-        self.reload()
+        """call reload() method if the files changed since last seen"""
+        if self._on_disk() != FileStorage.__signature:
+            self.reload()
+
+    def _on_disk(self):
+        """returns the size and mtime of the JSON file and its journal"""
+        signature = []
+        for name in (self.__file_path, self.__file_path + '.journal'):
+            try:
+                stat = os.stat(name)
+                signature.append((stat.st_size, stat.st_mtime_ns))
+            except OSError:
+                signature.append(None)
+        return tuple(signature)
 
-    def get(self, cls, id):
+    def subscribe(self, listener):
         """
-        Retrieves the object of a specific class if, otherwise all objects
+        registers listener to be called with every object added, changed
+        or deleted, and with None when all objects may have changed
         """
-        if cls and id:
-            if cls in classes.values() and isinstance(id, str):
-                specific_obj = self.all(cls)
-                for k, v in specific_obj.items():
-                    if k.split('.') == id:
-                        return v
-            else:
-                return
-        else:
-            return
+        self.__listeners.append(listener)
 
+    def _notify(self, obj):
+        """calls the listeners about obj"""
+        for listener in self.__listeners:
+            listener(obj)
+
+    def _touch(self, name):
+        """records a change to the objects of a class"""
+        self.__versions[name] = self.__versions.get(name, 0) + 1
+        self.__modified[name] = datetime.utcnow()
+
+    @traced("FileStorage.version")
+    def version(self, cls, **where):
+        """
+        returns a token that changes whenever an object of cls changes and
+        the time of the last change; where is accepted for DBStorage
+        compatibility, the token covers the whole class
+        """
+        name = self._class_name(cls)
+        token = "{}-{}".format(self.__boot, self.__versions.get(name, 0))
+        return token, self.__modified.get(name)
+
+    @traced("FileStorage.get")
+    def get(self, cls, id, eager=None, strategy=None, fields=None):
+        """
+        Retrieves the object of a specific class by its id, otherwise None
+        """
+        name = self._class_name(cls)
+        if name is None or not isinstance(id, str):
+            return None
+        key = name + "." + id
+        value = self.__classes.get(name, {}).get(key)
+        if value is None:
+            return None
+        return self._hydrate(key, value)
+
+    @traced("FileStorage.get_many")
+    def get_many(self, cls, ids, eager=None, strategy=None, fields=None):
+        """
+        Retrieves the objects of a class with the given ids, in the order
+        of ids and skipping unknown ones
+        """
+        name = self._class_name(cls)
+        if name is None:
+            return []
+        objs, found = self.__classes.get(name, {}), {}
+        for id in ids:
+            value = objs.get(name + "." + id) if isinstance(id, str) else None
+            if value is not None and id not in found:
+                found[id] = self._hydrate(name + "." + id, value)
+        return list(found.values())
+
+    @traced("FileStorage.count")
     def count(self, cls=None):
         """
             Counts the number of occurence of an object
         """
-        if (not cls) or (cls not in classes.values()):
-            return
-        elif cls in classes.values():
-            return len(self.all(cls))
+        if cls is None:
+            return len(self.__objects)
+        name = self._class_name(cls)
+        if name is None:
+            return None
+        return len(self.__classes.get(name, {}))
+
+    @traced("FileStorage.counts")
+    def counts(self):
+        """returns the number of objects of every class by class name"""
+        return {name: len(self.__classes.get(name, {})) for name in classes}
+
+    @traced("FileStorage.search_places")
+    def search_places(self, states=None, cities=None, amenities=None):
+        """
+        returns the places located in the given states or cities (all
+        places when neither is given) that have every given amenity,
+        ordered by creation date then id
+        """
+        links = self.__links.get("Place", {})
+        if states or cities:
+            city_ids = set(cities or ())
+            by_state = self.__links.get("City", {}).get("state_id", {})
+            for state_id in states or ():
+                city_ids.update(key.split('.', 1)[1]
+                                for key in by_state.get(state_id, ()))
+            by_city = links.get("city_id", {})
+            keys = set()
+            for city_id in city_ids:
+                keys.update(by_city.get(city_id, ()))
+        else:
+            keys = set(self.__classes.get("Place", {}))
+        by_amenity = links.get("amenity_ids", {})
+        for amenity_id in set(amenities or ()):
+            keys.intersection_update(by_amenity.get(amenity_id, ()))
+        objs = self.__classes.get("Place", {})
+        places = [self._hydrate(key, objs[key]) for key in keys
+                  if key in objs]
+        places.sort(key=lambda place: (place.created_at, place.id))
+        return places
+
+    @traced("FileStorage.page")
+    def page(self, cls, limit, after=None, fields=None, **where):
+        """
+        returns up to limit objects of cls ordered by creation date then
+        id, following the (created_at, id) pair after when it is given and
+        keeping only objects whose foreign keys match where
+        """
+        name = self._class_name(cls)
+        objs = self.__classes.get(name, {})
+        if where:
+            keys = None
+            links = self.__links.get(name, {})
+            for attr, value in where.items():
+                found = links.get(attr, {}).get(value, {})
+                keys = set(found) if keys is None else keys & set(found)
+            order = sorted((self.__created[key], key) for key in keys
+                           if key in self.__created)
         else:
-            return len(self.all())
+            order = self.__order.get(name)
+            if order is None:
+                order = sorted((self.__created[key], key) for key in objs
+                               if key in self.__created)
+                self.__order[name] = order
+        start = 0
+        if after is not None:
+            start = bisect.bisect_right(order, (after[0],
+                                                name + "." + after[1]))
+        return [self._hydrate(key, objs[key])
+                for created, key in order[start:start + limit]
+                if key in objs]
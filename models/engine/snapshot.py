@@ -0,0 +1,150 @@
+#!/usr/bin/python3
+"""
+Contains the binary snapshot format of FileStorage.
+
+A snapshot holds one section per class: a pickled dictionary whose
+"objects" are its raw records by key, the same dictionaries file.json
+holds, optionally with the "created", "links" and "linked" indexes
+FileStorage builds from them, so loading needs no work per record. The
+sections are followed by a table giving the class name, record count,
+offset, length and CRC-32 of each section, then by the offset of that
+table:
+
+    MAGIC | section... | table | table offset, MAGIC
+
+Only plain values are unpickled, so a snapshot cannot run code.
+convert_storage.py converts file.json to a snapshot and back.
+"""
+import io
+import os
+import pickle
+import struct
+import zlib
+
+MAGIC = b"HBNB\x01"
+# record count, offset, length and CRC-32 of a section, then name length
+ENTRY = struct.Struct("<IQQIH")
+TRAILER = struct.Struct("<Q5s")
+PROTOCOL = 4
+
+
+class Unpickler(pickle.Unpickler):
+    """Unpickler refusing everything that is not a plain value"""
+
+    def find_class(self, module, name):
+        """refuses to load any class or function"""
+        raise pickle.UnpicklingError(
+            "{}.{} is not allowed in a snapshot".format(module, name))
+
+
+def is_snapshot(path):
+    """tells whether the file at path is a binary snapshot"""
+    try:
+        with open(path, 'rb') as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def pack(objects, **indexes):
+    """
+    returns the section of objects, a dictionary of raw records by key,
+    holding the given indexes too, ready to be written
+    """
+    section = dict(indexes, objects=objects)
+    return pickle.dumps(section, protocol=PROTOCOL)
+
+
+def write(f, sections):
+    """
+    writes to f, a binary file, the snapshot of sections, a dictionary
+    of the record count and packed section of every class name, and
+    returns its table
+    """
+    f.write(MAGIC)
+    table = []
+    offset = len(MAGIC)
+    for name, (count, blob) in sections.items():
+        f.write(blob)
+        table.append((name, count, offset, len(blob), zlib.crc32(blob)))
+        offset += len(blob)
+    for name, count, start, length, crc in table:
+        name = name.encode("utf-8")
+        f.write(ENTRY.pack(count, start, length, crc, len(name)) + name)
+    f.write(TRAILER.pack(offset, MAGIC))
+    return table
+
+
+def sections(f):
+    """returns the (class name, count, offset, length, crc) of f's table"""
+    f.seek(-TRAILER.size, os.SEEK_END)
+    end = f.tell()
+    offset, magic = TRAILER.unpack(f.read(TRAILER.size))
+    if magic != MAGIC or not len(MAGIC) <= offset <= end:
+        raise ValueError("not a complete snapshot")
+    f.seek(offset)
+    table = f.read(end - offset)
+    entries, pos = [], 0
+    while pos < len(table):
+        count, start, length, crc, size = ENTRY.unpack_from(table, pos)
+        pos += ENTRY.size
+        entries.append((table[pos:pos + size].decode("utf-8"), count, start,
+                        length, crc))
+        pos += size
+    return entries
+
+
+def packed(f, entry):
+    """returns the packed section of f described by entry, from its table"""
+    name, count, start, length, crc = entry
+    f.seek(start)
+    blob = f.read(length)
+    if len(blob) != length or zlib.crc32(blob) != crc:
+        raise ValueError("corrupted {} section".format(name))
+    return blob
+
+
+def read_sections(f, names=None):
+    """
+    yields the class name and unpacked section of every section of the
+    snapshot in f, a binary file, only for the names in names if given
+    """
+    for entry in sections(f):
+        if names is None or entry[0] in names:
+            yield entry[0], Unpickler(io.BytesIO(packed(f, entry))).load()
+
+
+def read(f, names=None):
+    """
+    yields the key/record pairs of the snapshot in f, a binary file,
+    only for the class names in names when it is given
+    """
+    for name, section in read_sections(f, names):
+        yield from section["objects"].items()
+
+
+def convert(source, destination):
+    """
+    writes the objects of source to destination, as a snapshot when
+    source is a JSON file and as JSON when it is a snapshot
+    """
+    from models import codec
+    from models.engine.file_storage import iter_items
+    if is_snapshot(source):
+        with open(source, 'rb') as f, \
+                open(destination, 'w', encoding='utf-8') as out:
+            sep = "{"
+            for key, record in read(f):
+                out.write(sep + codec.dumps(key) + ": " +
+                          codec.dumps(record))
+                sep = ", "
+            out.write("}" if sep == ", " else "{}")
+        return "json"
+    by_class = {}
+    with open(source, 'r', encoding='utf-8') as f:
+        for key, record in iter_items(f):
+            by_class.setdefault(key.split('.')[0], {})[key] = record
+    with open(destination, 'wb') as out:
+        write(out, {name: (len(objects), pack(objects))
+                    for name, objects in by_class.items()})
+    return "snapshot"
@@ -15,9 +15,8 @@ class Review(BaseModel, Base):
         user_id = Column(String(60), ForeignKey('users.id'), nullable=False)
         text = Column(String(1024), nullable=False)
     else:
-        place_id = ""
-        user_id = ""
-        text = ""
+        _defaults = {"place_id": "", "user_id": "", "text": ""}
+        __slots__ = tuple(_defaults)
 
     def __init__(self, *args, **kwargs):
         """initializes Review"""
@@ -0,0 +1,32 @@
+#!/usr/bin/python3
+"""
+Contains the span hooks timing storage and serialization work
+"""
+from functools import wraps
+import time
+
+# callables given the name and duration in seconds of every span
+hooks = []
+
+
+def traced(name):
+    """
+    Decorates a function so each call is reported to the hooks as a span
+    called name; without hooks the function is called directly
+    """
+    def decorator(func):
+        """Wraps func in a span"""
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            """Calls func, timing it when someone listens"""
+            if not hooks:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                seconds = time.perf_counter() - start
+                for hook in list(hooks):
+                    hook(name, seconds)
+        return wrapper
+    return decorator
@@ -16,7 +16,8 @@ class State(BaseModel, Base):
         name = Column(String(128), nullable=False)
         cities = relationship("City", backref="state", cascade="all, delete")
     else:
-        name = ""
+        _defaults = {"name": ""}
+        __slots__ = tuple(_defaults)
 
     def __init__(self, *args, **kwargs):
         """initializes state"""
@@ -26,9 +27,4 @@ class State(BaseModel, Base):
         @property
         def cities(self):
             """getter for list of city instances related to the state"""
-            city_list = []
-            all_cities = models.storage.all(City)
-            for city in all_cities.values():
-                if city.state_id == self.id:
-                    city_list.append(city)
-            return city_list
+            return models.storage.related(City, "state_id", self.id)
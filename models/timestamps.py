@@ -0,0 +1,36 @@
+#!/usr/bin/python3
+"""
+Contains the codec of the created_at and updated_at timestamps
+"""
+from datetime import datetime
+
+# format the timestamps are stored and sent in
+time = "%Y-%m-%dT%H:%M:%S.%f"
+
+
+def canonical(text):
+    """tells whether text is a timestamp written exactly as by stringify"""
+    return type(text) is str and len(text) == 26 and text[10] == "T" and \
+        text[19] == "."
+
+
+def parse(text):
+    """returns the datetime of a timestamp written in the time format"""
+    if canonical(text):
+        try:
+            value = datetime.fromisoformat(text)
+        except ValueError:
+            pass
+        else:
+            if value.tzinfo is None:
+                return value
+    return datetime.strptime(text, time)
+
+
+def stringify(value):
+    """returns the datetime value written in the time format"""
+    if value.tzinfo is not None or value.year < 1000:
+        return value.strftime(time)
+    if value.microsecond:
+        return value.isoformat()
+    return value.isoformat() + ".000000"
@@ -0,0 +1,163 @@
+#!/usr/bin/python3
+"""Test the batch create/update/delete endpoints"""
+import models
+from models.city import City
+from models.place import Place
+from models.state import State
+from models.user import User
+from api.v1.app import app
+import unittest
+from unittest import mock
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestBatch(unittest.TestCase):
+    """Test /api/v1/<collection>/batch"""
+    def setUp(self):
+        """Add a city and a user to attach places to"""
+        self.client = app.test_client()
+        self.state = State(name="Batch")
+        self.city = City(name="Batch", state_id=self.state.id)
+        self.user = User(email="batch@hbnb.io", password="pwd")
+        self.added = [self.state, self.city, self.user]
+        for obj in self.added:
+            models.storage.new(obj)
+
+    def tearDown(self):
+        """Remove the added objects"""
+        for obj in self.added:
+            models.storage.delete(obj)
+
+    def send(self, method, collection, items):
+        """Sends a batch request, saving storage without touching disk"""
+        with mock.patch.object(models.storage, "save") as save:
+            response = self.client.open(
+                '/api/v1/{}/batch'.format(collection), method=method,
+                json=items)
+        self.assertEqual(save.call_count, 1)
+        return response
+
+    def test_create(self):
+        """Test that valid items are created and invalid ones reported"""
+        items = [{"name": "One", "city_id": self.city.id,
+                  "user_id": self.user.id},
+                 {"name": "Two", "city_id": "nope", "user_id": self.user.id},
+                 {"city_id": self.city.id, "user_id": self.user.id},
+                 "bad",
+                 {"name": "Three", "city_id": self.city.id,
+                  "user_id": self.user.id}]
+        response = self.send("POST", "places", items)
+        self.assertEqual(response.status_code, 200)
+        results = response.get_json()
+        self.assertEqual([result["status"] for result in results],
+                         [201, 404, 400, 400, 201])
+        self.assertEqual(results[2]["error"], "Missing name")
+        for result in (results[0], results[4]):
+            place = models.storage.get(Place, result["object"]["id"])
+            self.added.append(place)
+            self.assertEqual(place.city_id, self.city.id)
+
+    def test_create_ignores_client_ids(self):
+        """Test that new objects never take the id or dates sent"""
+        items = [{"name": "One", "id": self.state.id,
+                  "created_at": "2000-01-01T00:00:00.000000",
+                  "__class__": "City"},
+                 {"name": "Two", "id": self.state.id}]
+        results = self.send("POST", "states", items).get_json()
+        self.assertEqual([result["status"] for result in results],
+                         [201, 201])
+        ids = [result["object"]["id"] for result in results]
+        for obj_id in ids:
+            self.added.append(models.storage.get(State, obj_id))
+        self.assertNotIn(self.state.id, ids)
+        self.assertNotEqual(ids[0], ids[1])
+        self.assertEqual(results[0]["object"]["__class__"], "State")
+        self.assertNotEqual(results[0]["object"]["created_at"],
+                            "2000-01-01T00:00:00.000000")
+        self.assertEqual(self.state.name, "Batch")
+
+    def test_create_invalid_item(self):
+        """Test that an item failing to build fails alone, adding nothing"""
+        before = models.storage.count(User)
+        items = [{"email": "one@hbnb.io", "password": "pwd"},
+                 {"email": "two@hbnb.io", "password": 5}]
+        with mock.patch.object(models.storage, "new") as new:
+            results = self.send("POST", "users", items).get_json()
+        self.assertEqual([result["status"] for result in results],
+                         [201, 400])
+        self.assertEqual(results[1]["error"], "Invalid User")
+        self.assertEqual(new.call_count, 1)
+        self.assertEqual(models.storage.count(User), before)
+
+    def test_update(self):
+        """Test that items are updated by id, leaving parents alone"""
+        state = State(name="Old")
+        models.storage.new(state)
+        self.added.append(state)
+        response = self.send("PUT", "cities", [
+            {"id": self.city.id, "name": "New", "state_id": state.id},
+            {"id": "nope", "name": "New"},
+            {"name": "New"}])
+        results = response.get_json()
+        self.assertEqual([result["status"] for result in results],
+                         [200, 404, 400])
+        self.assertEqual(self.city.name, "New")
+        self.assertEqual(self.city.state_id, self.state.id)
+
+    def test_update_round_trip(self):
+        """Test that an object read from the API can be sent back"""
+        item = self.client.get('/api/v1/states/' + self.state.id).get_json()
+        item["name"] = "Round"
+        results = self.send("PUT", "states", [item]).get_json()
+        self.assertEqual([result["status"] for result in results], [200])
+        self.assertEqual(results[0]["object"]["__class__"], "State")
+        self.assertEqual(self.state.name, "Round")
+        self.assertIs(type(self.state), State)
+
+    def test_update_invalid_item(self):
+        """Test that an item failing to apply fails alone, changing nothing"""
+        city = City(name="Other", state_id=self.state.id)
+        models.storage.new(city)
+        self.added.append(city)
+        set_attr = City.__setattr__
+
+        def refuse(obj, name, value):
+            """sets attributes other than bad"""
+            if name == "bad":
+                raise TypeError(name)
+            set_attr(obj, name, value)
+        with mock.patch.object(City, "__setattr__", refuse):
+            results = self.send("PUT", "cities", [
+                {"id": self.city.id, "name": "Changed", "bad": 1},
+                {"id": city.id, "name": "Changed"}]).get_json()
+        self.assertEqual([result["status"] for result in results],
+                         [400, 200])
+        self.assertEqual(results[0]["error"], "Invalid City")
+        self.assertEqual(self.city.name, "Batch")
+        self.assertEqual(city.name, "Changed")
+
+    def test_delete(self):
+        """Test that listed objects are deleted"""
+        state = State(name="Gone")
+        models.storage.new(state)
+        response = self.send("DELETE", "states", [state.id, "nope", 3])
+        results = response.get_json()
+        self.assertEqual([result["status"] for result in results],
+                         [200, 404, 404])
+        self.assertIsNone(models.storage.get(State, state.id))
+
+    def test_bad_requests(self):
+        """Test that unknown collections and bad bodies are rejected"""
+        response = self.client.post('/api/v1/countries/batch', json=[])
+        self.assertEqual(response.status_code, 404)
+        response = self.client.post('/api/v1/states/batch',
+                                    json={"name": "x"})
+        self.assertEqual(response.status_code, 400)
+        with mock.patch("api.v1.views.batch.BATCH_MAX", 1):
+            response = self.client.post('/api/v1/states/batch',
+                                        json=[{}, {}])
+        self.assertEqual(response.status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
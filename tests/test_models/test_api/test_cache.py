@@ -0,0 +1,123 @@
+#!/usr/bin/python3
+"""Test the response cache of the collection endpoints"""
+import models
+from models.city import City
+from models.state import State
+from models.engine.file_storage import FileStorage
+from api.v1.app import app
+from api.v1.cache import ResponseCache, cache
+import unittest
+from unittest import mock
+
+
+class TestResponseCache(unittest.TestCase):
+    """Test the ResponseCache class on its own"""
+    def test_lru_bound(self):
+        """Test that the least recently used entry is evicted"""
+        lru = ResponseCache(size=2, ttl=60)
+        lru.put("a", 1, [("A",)], lru.generation)
+        lru.put("b", 2, [("B",)], lru.generation)
+        lru.get("a")
+        lru.put("c", 3, [("C",)], lru.generation)
+        self.assertEqual((lru.get("a"), lru.get("b"), lru.get("c")),
+                         (1, None, 3))
+        self.assertEqual(len(lru), 2)
+
+    def test_ttl(self):
+        """Test that entries expire"""
+        lru = ResponseCache(size=2, ttl=0)
+        lru.put("a", 1, [("A",)], lru.generation)
+        with mock.patch("api.v1.cache.time.monotonic",
+                        return_value=float("inf")):
+            self.assertIsNone(lru.get("a"))
+        self.assertEqual(len(lru), 0)
+
+    def test_tags(self):
+        """Test that only entries tagged by a changed object are dropped"""
+        lru = ResponseCache()
+        state = State(name="Tagged")
+        city = City(name="Tagged", state_id=state.id)
+        lru.put("states", 1, [("State",)], lru.generation)
+        lru.put("cities", 2, [("City", "state_id", state.id),
+                              ("State", "id", state.id)], lru.generation)
+        lru.put("others", 3, [("City", "state_id", "other")],
+                lru.generation)
+        lru.invalidate(city)
+        self.assertEqual([lru.get(key) for key in
+                          ("states", "cities", "others")], [1, None, 3])
+        lru.invalidate(state)
+        self.assertIsNone(lru.get("states"))
+        lru.invalidate(None)
+        self.assertEqual(len(lru), 0)
+
+    def test_stale_put(self):
+        """Test that a value built before an invalidation is not kept"""
+        lru = ResponseCache()
+        generation = lru.generation
+        lru.invalidate(State())
+        lru.put("a", 1, [("A",)], generation)
+        self.assertIsNone(lru.get("a"))
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestCachedViews(unittest.TestCase):
+    """Test the cache in front of /api/v1/states"""
+    def setUp(self):
+        """Add a state to list"""
+        self.client = app.test_client()
+        self.state = State(name="Cached")
+        models.storage.new(self.state)
+
+    def tearDown(self):
+        """Remove the added states"""
+        models.storage.delete(self.state)
+
+    def test_served_from_cache(self):
+        """Test that a repeated request does not read storage"""
+        first = self.client.get('/api/v1/states')
+        with mock.patch.object(models.storage, "all") as all_mock:
+            second = self.client.get('/api/v1/states')
+        all_mock.assert_not_called()
+        self.assertEqual(first.data, second.data)
+
+    def test_invalidated_by_writes(self):
+        """Test that new and deleted states show up at once"""
+        self.client.get('/api/v1/states')
+        other = State(name="Other")
+        models.storage.new(other)
+        ids = [s["id"] for s in self.client.get('/api/v1/states').json]
+        self.assertIn(other.id, ids)
+        models.storage.delete(other)
+        ids = [s["id"] for s in self.client.get('/api/v1/states').json]
+        self.assertNotIn(other.id, ids)
+
+    def test_unnotified_writes(self):
+        """Test that writes the cache never heard of are not hidden"""
+        first = self.client.get('/api/v1/states')
+        other = State(name="Other")
+        with mock.patch.object(FileStorage, "_FileStorage__listeners", []):
+            models.storage.new(other)
+        try:
+            second = self.client.get('/api/v1/states')
+        finally:
+            models.storage.delete(other)
+        self.assertNotEqual(first.headers["ETag"], second.headers["ETag"])
+        self.assertIn(other.id, [s["id"] for s in second.json])
+
+    def test_nested_invalidation(self):
+        """Test that a new city only drops its own state's cities"""
+        url = '/api/v1/states/{}/cities'.format(self.state.id)
+        self.client.get('/api/v1/states')
+        self.assertEqual(self.client.get(url).json, [])
+        size = len(cache)
+        city = City(name="Cached", state_id=self.state.id)
+        models.storage.new(city)
+        try:
+            self.assertEqual(len(cache), size - 1)
+            self.assertEqual(len(self.client.get(url).json), 1)
+        finally:
+            models.storage.delete(city)
+
+
+if __name__ == '__main__':
+    unittest.main()
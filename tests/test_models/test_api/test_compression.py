@@ -0,0 +1,78 @@
+#!/usr/bin/python3
+"""Test the negotiated compression of responses"""
+import gzip
+import models
+from models.state import State
+from api.v1 import compression
+from api.v1.app import app
+import unittest
+from unittest import mock
+import zlib
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestCompression(unittest.TestCase):
+    """Test compressed /api/v1 responses"""
+    def setUp(self):
+        """Add enough states to pass the size threshold"""
+        self.client = app.test_client()
+        self.states = [State(name="Compressed{}".format(i))
+                       for i in range(40)]
+        for state in self.states:
+            models.storage.new(state)
+
+    def tearDown(self):
+        """Remove the added states"""
+        for state in self.states:
+            models.storage.delete(state)
+
+    def test_gzip(self):
+        """Test that gzip bodies decode to the identity body"""
+        plain = self.client.get('/api/v1/states')
+        response = self.client.get('/api/v1/states',
+                                   headers={"Accept-Encoding": "gzip"})
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response.headers["Vary"])
+        self.assertEqual(gzip.decompress(response.data), plain.data)
+        self.assertEqual(response.headers["ETag"],
+                         "W/" + plain.headers["ETag"])
+
+    def test_negotiation(self):
+        """Test that the client's preferences are followed"""
+        response = self.client.get('/api/v1/states', headers={
+            "Accept-Encoding": "gzip;q=0.5, deflate"})
+        self.assertEqual(response.headers["Content-Encoding"], "deflate")
+        self.assertTrue(zlib.decompress(response.data))
+        response = self.client.get('/api/v1/states',
+                                   headers={"Accept-Encoding": "identity"})
+        self.assertNotIn("Content-Encoding", response.headers)
+
+    def test_small_bodies(self):
+        """Test that bodies under the threshold are left alone"""
+        response = self.client.get('/api/v1/status',
+                                   headers={"Accept-Encoding": "gzip"})
+        self.assertNotIn("Content-Encoding", response.headers)
+
+    def test_memo(self):
+        """Test that a payload is compressed once per version"""
+        headers = {"Accept-Encoding": "gzip"}
+        first = self.client.get('/api/v1/states', headers=headers)
+        with mock.patch.object(compression, "compressor") as compressor:
+            second = self.client.get('/api/v1/states', headers=headers)
+        compressor.assert_not_called()
+        self.assertEqual(first.data, second.data)
+        response = self.client.get('/api/v1/states', headers=dict(
+            headers, **{"If-None-Match": first.headers["ETag"]}))
+        self.assertEqual(response.status_code, 304)
+
+    def test_streamed(self):
+        """Test that streamed bodies are compressed on the fly"""
+        plain = self.client.get('/api/v1/users')
+        response = self.client.get('/api/v1/users',
+                                   headers={"Accept-Encoding": "gzip"})
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(response.data), plain.data)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+#!/usr/bin/python3
+"""Test the ETag and Last-Modified support of the GET endpoints"""
+import models
+from models.state import State
+from api.v1.app import app
+import unittest
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestConditional(unittest.TestCase):
+    """Test conditional GETs of /api/v1/states"""
+    def setUp(self):
+        """Add a state to fetch"""
+        self.client = app.test_client()
+        self.state = State(name="Conditional")
+        models.storage.new(self.state)
+
+    def tearDown(self):
+        """Remove the added states"""
+        models.storage.delete(self.state)
+
+    def test_collection_not_modified(self):
+        """Test that a matching ETag gets an empty 304"""
+        response = self.client.get('/api/v1/states')
+        etag = response.headers["ETag"]
+        response = self.client.get('/api/v1/states',
+                                   headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.data, b"")
+        self.assertEqual(response.headers["ETag"], etag)
+
+    def test_collection_changed(self):
+        """Test that adding a state changes the ETag"""
+        etag = self.client.get('/api/v1/states').headers["ETag"]
+        other = State(name="Other")
+        models.storage.new(other)
+        try:
+            response = self.client.get('/api/v1/states',
+                                       headers={"If-None-Match": etag})
+        finally:
+            models.storage.delete(other)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers["ETag"], etag)
+
+    def test_query_changes_etag(self):
+        """Test that pages of one collection get different ETags"""
+        first = self.client.get('/api/v1/states').headers["ETag"]
+        paged = self.client.get('/api/v1/states?limit=1').headers["ETag"]
+        self.assertNotEqual(first, paged)
+
+    def test_object_not_modified(self):
+        """Test the validators of a single object"""
+        url = '/api/v1/states/' + self.state.id
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("Last-Modified", response.headers)
+        for headers in ({"If-None-Match": response.headers["ETag"]},
+                        {"If-Modified-Since":
+                         response.headers["Last-Modified"]}):
+            with self.subTest(headers=headers):
+                self.assertEqual(
+                    self.client.get(url, headers=headers).status_code, 304)
+
+    def test_object_modified(self):
+        """Test that an updated object is sent again"""
+        url = '/api/v1/states/' + self.state.id
+        etag = self.client.get(url).headers["ETag"]
+        self.state.name = "Renamed"
+        self.state.updated_at = self.state.updated_at.replace(year=2100)
+        response = self.client.get(url, headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()["name"], "Renamed")
+
+    def test_missing_parent(self):
+        """Test that a nested collection of a missing parent is a 404"""
+        response = self.client.get('/api/v1/states/nope/cities')
+        self.assertEqual(response.status_code, 404)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+#!/usr/bin/python3
+"""Test the fields parameter of the GET endpoints"""
+import models
+from models.city import City
+from models.state import State
+from api.v1.app import app
+import unittest
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestFields(unittest.TestCase):
+    """Test sparse fieldsets on /api/v1 collections and objects"""
+    def setUp(self):
+        """Add a state with a city"""
+        self.client = app.test_client()
+        self.state = State(name="Fields")
+        self.city = City(name="Fields", state_id=self.state.id)
+        for obj in (self.state, self.city):
+            models.storage.new(obj)
+
+    def tearDown(self):
+        """Remove the added objects"""
+        for obj in (self.state, self.city):
+            models.storage.delete(obj)
+
+    def test_collections(self):
+        """Test that every listed object only has the fields asked for"""
+        for url in ('/api/v1/states?fields=id,name',
+                    '/api/v1/states?fields=id,name&limit=2',
+                    '/api/v1/users?fields=id,name',
+                    '/api/v1/states/{}/cities?fields=id,name'.format(
+                        self.state.id),
+                    '/api/v1/states?fields=id,name&ids=' + self.state.id):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                for obj in response.get_json():
+                    self.assertLessEqual(set(obj), {"id", "name"})
+
+    def test_object(self):
+        """Test the fields of a single object"""
+        response = self.client.get('/api/v1/cities/{}?fields=name'.format(
+            self.city.id))
+        self.assertEqual(response.get_json(), {"name": "Fields"})
+
+    def test_without_fields(self):
+        """Test that objects are whole without the parameter"""
+        response = self.client.get('/api/v1/cities/' + self.city.id)
+        self.assertIn("__class__", response.get_json())
+        self.assertIn("created_at", response.get_json())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+#!/usr/bin/python3
+"""Test the JSON provider of the API"""
+from datetime import datetime
+import json
+from api.v1.app import app
+from api.v1.json_provider import CodecJSONProvider
+import unittest
+
+
+class TestJSONProvider(unittest.TestCase):
+    """Test /api/v1 responses are encoded like Flask's default"""
+
+    def test_provider(self):
+        """Test the app uses the codec provider"""
+        self.assertIsInstance(app.json, CodecJSONProvider)
+
+    def test_response(self):
+        """Test responses decode to what Flask's default would send"""
+        obj = {"b": [1, 2.5, None], "a": "é", "when": datetime(2020, 1, 2)}
+        with app.app_context():
+            data = app.json.response(obj).get_data()
+            self.assertEqual(json.loads(data), {
+                "a": "é", "b": [1, 2.5, None],
+                "when": "Thu, 02 Jan 2020 00:00:00 GMT"})
+            self.assertEqual(list(json.loads(data)), ["a", "b", "when"])
+            self.assertEqual(app.json.loads(b'{"a": [1]}'), {"a": [1]})
+
+    def test_non_finite(self):
+        """Test NaN and infinities are sent as Flask's default sends them"""
+        with app.app_context():
+            data = app.json.response({"latitude": float("nan"),
+                                      "longitude": float("inf")}).get_data()
+        self.assertEqual(data.replace(b" ", b"").strip(),
+                         b'{"latitude":NaN,"longitude":Infinity}')
+
+    def test_bad_json(self):
+        """Test invalid request bodies are still rejected"""
+        client = app.test_client()
+        response = client.post('/api/v1/states', data="{bad",
+                               content_type="application/json")
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,58 @@
+#!/usr/bin/python3
+"""Test fetching many objects by id"""
+import models
+from models.city import City
+from models.state import State
+from api.v1.app import app
+import unittest
+from unittest import mock
+
+
+class TestLookup(unittest.TestCase):
+    """Test the ids parameter and the lookup endpoints"""
+    def setUp(self):
+        """Add a few states and a city"""
+        self.client = app.test_client()
+        self.states = [State(name="Ids{}".format(i)) for i in range(3)]
+        self.city = City(name="Ids", state_id=self.states[0].id)
+        for obj in self.states + [self.city]:
+            models.storage.new(obj)
+
+    def tearDown(self):
+        """Remove the added objects"""
+        for obj in self.states + [self.city]:
+            models.storage.delete(obj)
+
+    def test_ids_parameter(self):
+        """Test that ids returns the listed states in order"""
+        ids = [self.states[2].id, "nope", self.states[0].id]
+        response = self.client.get('/api/v1/states?ids=' + ",".join(ids))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([state["id"] for state in response.get_json()],
+                         [self.states[2].id, self.states[0].id])
+
+    def test_ids_only_collections(self):
+        """Test the collections that can only be listed by ids"""
+        response = self.client.get('/api/v1/cities?ids=' + self.city.id)
+        self.assertEqual(response.get_json()[0]["name"], "Ids")
+        response = self.client.get('/api/v1/cities')
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get('/api/v1/places?ids=nope')
+        self.assertEqual(response.get_json(), [])
+
+    def test_lookup(self):
+        """Test that the POST lookup resolves ids with one storage call"""
+        ids = [state.id for state in self.states]
+        with mock.patch.object(models.storage, "get_many",
+                               wraps=models.storage.get_many) as get_many:
+            response = self.client.post('/api/v1/states/lookup', json=ids)
+        get_many.assert_called_once()
+        self.assertEqual([state["id"] for state in response.get_json()],
+                         ids)
+        with mock.patch("api.v1.lookup.IDS_MAX", 2):
+            response = self.client.post('/api/v1/states/lookup', json=ids)
+        self.assertEqual(response.status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
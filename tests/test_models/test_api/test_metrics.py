@@ -0,0 +1,75 @@
+#!/usr/bin/python3
+"""Test the request and storage metrics"""
+import models
+from api.v1 import metrics
+from api.v1.app import app
+from models import spans
+import unittest
+from unittest import mock
+
+
+class TestMetrics(unittest.TestCase):
+    """Test the /metrics endpoint and the slow request log"""
+    def setUp(self):
+        """Create a test client"""
+        self.client = app.test_client()
+
+    def test_exposition(self):
+        """Test that requests and storage calls show up in /metrics"""
+        self.client.get('/api/v1/stats')
+        response = self.client.get('/metrics')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, "text/plain")
+        text = response.get_data(as_text=True)
+        self.assertIn('hbnb_request_duration_seconds_count{'
+                      'route="/api/v1/stats",method="GET",status="200"}',
+                      text)
+        self.assertIn('hbnb_storage_calls_total{method="counts"}', text)
+        self.assertIn('hbnb_request_storage_calls_bucket{'
+                      'route="/api/v1/stats",method="GET",le="1"}', text)
+
+    def test_storage_calls_counted(self):
+        """Test that storage calls are counted once per call"""
+        before = dict(metrics.metrics.calls).get("counts", [0, 0])[0]
+        models.storage.counts()
+        self.assertEqual(metrics.metrics.calls["counts"][0], before + 1)
+
+    def test_storage_calls_from_spans(self):
+        """Test that storage calls are timed by the spans, not wrappers"""
+        self.assertIn(metrics.observe_span, spans.hooks)
+        for name in metrics.STORAGE_METHODS:
+            self.assertNotIn(name, vars(models.storage))
+        before = dict(metrics.metrics.calls)
+        metrics.observe_span("BaseModel.to_dict", 0.5)
+        self.assertEqual(metrics.metrics.calls, before)
+
+    def test_pool_metrics(self):
+        """Test that the connection pool statistics are exposed"""
+        stats = {"size": 5, "checked_out": 1, "overflow": -4,
+                 "checkouts": 12, "timeouts": 0, "wait_seconds": 0.5,
+                 "max_wait_seconds": 0.25}
+        with mock.patch.object(metrics.storage, "pool_stats",
+                               return_value=stats, create=True):
+            text = self.client.get('/metrics').get_data(as_text=True)
+        self.assertIn("# TYPE hbnb_db_pool_checkouts_total counter", text)
+        self.assertIn("hbnb_db_pool_checkouts_total 12\n", text)
+        self.assertIn("hbnb_db_pool_checked_out 1\n", text)
+        self.assertIn("hbnb_db_pool_max_wait_seconds 0.25\n", text)
+
+    def test_remote_clients(self):
+        """Test that /metrics is only served locally by default"""
+        response = self.client.get(
+            '/metrics', environ_base={"REMOTE_ADDR": "10.0.0.1"})
+        self.assertEqual(response.status_code, 404)
+
+    def test_slow_request_log(self):
+        """Test that requests over the thresholds are logged"""
+        with mock.patch.object(metrics, "SLOW_CALLS", 0), \
+                self.assertLogs(app.logger, "WARNING") as logs:
+            self.client.get('/api/v1/stats')
+        self.assertIn("slow request: GET /api/v1/stats", logs.output[0])
+        self.assertIn("counts 1x", logs.output[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
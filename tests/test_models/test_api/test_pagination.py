@@ -0,0 +1,61 @@
+#!/usr/bin/python3
+"""Test the limit/cursor pagination of the collection endpoints"""
+import models
+from models.state import State
+from api.v1.app import app
+import unittest
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestPagination(unittest.TestCase):
+    """Test paging through /api/v1/states"""
+    def setUp(self):
+        """Add a few states to page through"""
+        self.client = app.test_client()
+        self.states = [State(name="Page{}".format(i)) for i in range(3)]
+        for state in self.states:
+            models.storage.new(state)
+
+    def tearDown(self):
+        """Remove the added states"""
+        for state in self.states:
+            models.storage.delete(state)
+
+    def test_pages_cover_collection(self):
+        """Test that following the next links returns every state once"""
+        url, seen = '/api/v1/states?limit=2', []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            page = response.get_json()
+            self.assertLessEqual(len(page), 2)
+            seen.extend(state["id"] for state in page)
+            link = response.headers.get("Link")
+            url = link[1:link.index(">")] if link else None
+        self.assertEqual(len(seen), len(set(seen)))
+        self.assertEqual(len(seen), models.storage.count(State))
+
+    def test_next_keeps_parameters(self):
+        """Test that the next link keeps the other query parameters"""
+        response = self.client.get('/api/v1/states?limit=1&fields=name')
+        link = response.headers["Link"]
+        page = self.client.get(link[1:link.index(">")]).get_json()
+        self.assertEqual(len(page), 1)
+        self.assertEqual(set(page[0]), {"name"})
+
+    def test_invalid_parameters(self):
+        """Test that bad limits and cursors are rejected"""
+        for query in ('limit=0', 'limit=x', 'limit=2&cursor=bad'):
+            with self.subTest(query=query):
+                response = self.client.get('/api/v1/states?' + query)
+                self.assertEqual(response.status_code, 400)
+
+    def test_without_limit(self):
+        """Test that the full list is returned without a limit"""
+        response = self.client.get('/api/v1/states')
+        self.assertEqual(len(response.get_json()), models.storage.count(State))
+        self.assertNotIn("Link", response.headers)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+#!/usr/bin/python3
+"""Test the on-demand profiling endpoint"""
+from api.v1 import profiling
+from api.v1.app import app
+import models
+from models import spans
+import unittest
+from unittest import mock
+
+
+class TestProfiling(unittest.TestCase):
+    """Test /profile and the span hooks"""
+    def setUp(self):
+        """Enable profiling with a known token"""
+        self.client = app.test_client()
+        patcher = mock.patch.object(profiling, "TOKEN", "secret")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.headers = {"X-Profile-Token": "secret"}
+
+    def tearDown(self):
+        """Stop any running profile"""
+        if profiling.session is not None:
+            profiling.session.finish()
+
+    def test_gate(self):
+        """Test that profiling needs the token and is off without one"""
+        response = self.client.get('/profile')
+        self.assertEqual(response.status_code, 403)
+        with mock.patch.object(profiling, "TOKEN", None):
+            response = self.client.get('/profile', headers=self.headers)
+        self.assertEqual(response.status_code, 404)
+
+    def test_cprofile_requests(self):
+        """Test a cProfile of the next two requests"""
+        response = self.client.post('/profile', headers=self.headers,
+                                    json={"mode": "cprofile",
+                                          "requests": 2})
+        self.assertEqual(response.status_code, 202)
+        self.client.get('/api/v1/states?fields=id')
+        response = self.client.get('/profile', headers=self.headers)
+        self.assertEqual(response.get_json()["status"], "running")
+        self.client.get('/api/v1/states?fields=id')
+        response = self.client.get('/profile', headers=self.headers)
+        text = response.get_data(as_text=True)
+        self.assertIn("cprofile profile of 2 requests", text)
+        self.assertIn("function calls", text)
+        self.assertIn(type(models.storage).__name__ + ".all", text)
+        self.assertNotIn(profiling.session.span, spans.hooks)
+        response = self.client.get('/profile?format=json',
+                                   headers=self.headers)
+        self.assertEqual(response.get_json()["requests"], 2)
+        response = self.client.get('/profile?format=collapsed',
+                                   headers=self.headers)
+        self.assertEqual(response.status_code, 400)
+
+    def test_sample_collapsed(self):
+        """Test that a sampling profile gives collapsed stacks"""
+        with mock.patch.object(profiling, "INTERVAL", 0.0005):
+            self.client.post('/profile', headers=self.headers,
+                             json={"mode": "sample", "seconds": 5})
+            for i in range(20):
+                self.client.get('/api/v1/stats')
+        self.client.delete('/profile', headers=self.headers)
+        response = self.client.get('/profile?format=collapsed',
+                                   headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        for line in response.get_data(as_text=True).splitlines():
+            stack, count = line.rsplit(" ", 1)
+            self.assertTrue(count.isdigit())
+
+    def test_bad_requests(self):
+        """Test that bad profile requests are refused"""
+        for payload in ({"mode": "x", "requests": 1}, {"requests": 0},
+                        {"requests": 1, "seconds": 1}, {}):
+            with self.subTest(payload=payload):
+                response = self.client.post('/profile', json=payload,
+                                            headers=self.headers)
+                self.assertEqual(response.status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
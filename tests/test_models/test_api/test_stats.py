@@ -1,28 +1,23 @@
 import unittest
-from api.v1.views.index import stats
+from api.v1.app import app
 from unittest.mock import patch
-from flask import Flask
 
 
 class TestStatsEndpoint(unittest.TestCase):
     def setUp(self):
-        self.app = Flask(__name__)
-        self.app_context = self.app.app_context()
-        self.app_context.push()
-        self.client = self.app.test_client()
-
-    def tearDown(self):
-        self.app_context.pop()
+        self.client = app.test_client()
 
     @patch('api.v1.views.index.storage')
     def test_stats_endpoint(self, mock_storage):
-        mock_storage.count.side_effect = {
+        mock_storage.counts.return_value = {
             'Amenity': 47, 'City': 36, 'Place': 154, 'Review': 718,
-            'State': 27, 'User': 31}.get
+            'State': 27, 'User': 31}
         response = self.client.get('/api/v1/stats')
         data = response.get_json()
 
         self.assertEqual(response.status_code, 200)
+        self.assertEqual(mock_storage.counts.call_count, 1)
+        mock_storage.count.assert_not_called()
         self.assertEqual(data['amenities'], 47)
         self.assertEqual(data['cities'], 36)
         self.assertEqual(data['places'], 154)
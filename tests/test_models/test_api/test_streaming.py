@@ -0,0 +1,66 @@
+#!/usr/bin/python3
+"""Test the streamed JSON and NDJSON collection responses"""
+import json
+import models
+from models.place import Place
+from models.user import User
+from api.v1.app import app
+import unittest
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestStreaming(unittest.TestCase):
+    """Test /api/v1/users and /api/v1/places_search streaming"""
+    def setUp(self):
+        """Add a few users to stream"""
+        self.client = app.test_client()
+        self.users = [User(email="{}@hbnb.io".format(i)) for i in range(3)]
+        for user in self.users:
+            models.storage.new(user)
+
+    def tearDown(self):
+        """Remove the added users"""
+        for user in self.users:
+            models.storage.delete(user)
+
+    def test_json_array(self):
+        """Test that the streamed array holds every user"""
+        response = self.client.get('/api/v1/users')
+        self.assertTrue(response.is_streamed)
+        self.assertEqual(response.mimetype, "application/json")
+        users = json.loads(response.get_data(as_text=True))
+        self.assertEqual(len(users), models.storage.count(User))
+        self.assertTrue({u.id for u in self.users} <=
+                        {u["id"] for u in users})
+
+    def test_ndjson(self):
+        """Test that NDJSON is written one user per line"""
+        response = self.client.get(
+            '/api/v1/users', headers={"Accept": "application/x-ndjson"})
+        self.assertEqual(response.mimetype, "application/x-ndjson")
+        lines = response.get_data(as_text=True).splitlines()
+        self.assertEqual(len(lines), models.storage.count(User))
+        for line in lines:
+            self.assertEqual(json.loads(line)["__class__"], "User")
+
+    def test_places_search_without_filters(self):
+        """Test that an unfiltered search streams every place"""
+        response = self.client.post('/api/v1/places_search',
+                                    json={"states": []})
+        places = json.loads(response.get_data(as_text=True))
+        self.assertEqual(len(places), models.storage.count(Place))
+        for place in places:
+            self.assertNotIn("amenities", place)
+
+    def test_places_search_invalid_filters(self):
+        """Test that filters other than lists of ids are rejected"""
+        for payload in ({"states": [[1]]}, {"cities": [{}]},
+                        {"amenities": "x"}, {"states": [1]}, [["x"]]):
+            with self.subTest(payload=payload):
+                response = self.client.post('/api/v1/places_search',
+                                            json=payload)
+                self.assertEqual(response.status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+#!/usr/bin/python3
+"""Test that updates cannot reach the bookkeeping of the models"""
+import models
+from models.city import City
+from models.state import State
+from models.user import User
+from api.v1.app import app
+import unittest
+from unittest import mock
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestReservedAttributes(unittest.TestCase):
+    """Test PUT /api/v1/states/<id> with reserved attribute names"""
+    def setUp(self):
+        """Add a state to update"""
+        self.client = app.test_client()
+        self.state = State(name="Reserved")
+        models.storage.new(self.state)
+
+    def tearDown(self):
+        """Remove the added state"""
+        models.storage.delete(self.state)
+
+    def test_reserved_names(self):
+        """Test that reserved names are kept apart from the model's own"""
+        url = '/api/v1/states/' + self.state.id
+        created = self.state.to_dict()["created_at"]
+        for name, value in (("_extra", 5), ("_stamps", ["x", "y"]),
+                            ("_encoded", "{}"), ("_defaults", 5),
+                            ("__dict__", 5), ("cities", "x")):
+            with self.subTest(name=name), \
+                    mock.patch.object(models.storage, "save"):
+                response = self.client.put(url, json={name: value})
+                self.assertEqual(response.status_code, 200)
+                for get in (url, '/api/v1/states'):
+                    self.assertEqual(self.client.get(get).status_code, 200)
+                state = self.client.get(url).get_json()
+                self.assertEqual(state["created_at"], created)
+                self.assertEqual(state["name"], "Reserved")
+                self.assertEqual(self.state.cities, [])
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestRelationshipNames(unittest.TestCase):
+    """Test updates naming the relationships of a model"""
+    def setUp(self):
+        """Add a user and a city to update"""
+        self.client = app.test_client()
+        self.user = User(email="rel@hbnb.io", password="pwd")
+        self.city = City(name="Rel", state_id="none")
+        for obj in (self.user, self.city):
+            models.storage.new(obj)
+
+    def tearDown(self):
+        """Remove the added objects"""
+        for obj in (self.user, self.city):
+            models.storage.delete(obj)
+
+    def test_relationships_ignored(self):
+        """Test that relationship names are neither set nor stored"""
+        for url, payload in (
+                ('/api/v1/users/' + self.user.id,
+                 {"places": "x", "reviews": "x", "first_name": "Ann"}),
+                ('/api/v1/cities/' + self.city.id,
+                 {"places": "x", "name": "Ann"})):
+            with self.subTest(url=url), \
+                    mock.patch.object(models.storage, "save"):
+                response = self.client.put(url, json=payload)
+                self.assertEqual(response.status_code, 200)
+                self.assertNotIn("places", response.get_json())
+                self.assertNotIn("reviews", response.get_json())
+        self.assertEqual(self.user.first_name, "Ann")
+        self.assertEqual((self.user.places, self.user.reviews), ([], []))
+        self.assertEqual(self.city.places, [])
+
+    def test_batch_relationships_ignored(self):
+        """Test that batch updates skip relationship names too"""
+        with mock.patch.object(models.storage, "save"):
+            response = self.client.put('/api/v1/users/batch', json=[
+                {"id": self.user.id, "places": "x", "reviews": "x"}])
+        result = response.get_json()[0]
+        self.assertEqual(result["status"], 200)
+        self.assertNotIn("places", result["object"])
+        self.assertNotIn("reviews", result["object"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,9 +2,11 @@
 """Test BaseModel for expected behavior and documentation"""
 from datetime import datetime
 import inspect
+import json
 import models
 import pep8 as pycodestyle
 import time
+import tracemalloc
 import unittest
 from unittest import mock
 BaseModel = models.base_model.BaseModel
@@ -139,6 +141,70 @@ class TestBaseModel(unittest.TestCase):
         self.assertEqual(new_d["created_at"], bm.created_at.strftime(t_format))
         self.assertEqual(new_d["updated_at"], bm.updated_at.strftime(t_format))
 
+    def test_to_dict_fields(self):
+        """test that to_dict keeps only the fields asked for"""
+        bm = BaseModel()
+        bm.name = "Holberton"
+        bm.password = "secret"
+        self.assertEqual(bm.to_dict(fields=("id", "name", "nope")),
+                         {"id": bm.id, "name": "Holberton"})
+        new_d = bm.to_dict(fields=("updated_at", "__class__", "password"))
+        self.assertEqual(new_d, {"__class__": "BaseModel",
+                                 "updated_at": bm.updated_at.strftime(
+                                     "%Y-%m-%dT%H:%M:%S.%f")})
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing File Storage")
+    def test_slots(self):
+        """test that instances keep attributes in slots and extras"""
+        bm = BaseModel()
+        self.assertIn("id", BaseModel.__slots__)
+        bm.name = "Holberton"
+        self.assertEqual(bm.__dict__["name"], "Holberton")
+        self.assertEqual(bm.__dict__["id"], bm.id)
+        del bm.name
+        self.assertFalse(hasattr(bm, "name"))
+        self.assertNotIn("name", bm.to_dict())
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing File Storage")
+    def test_to_json_not_kept(self):
+        """test that saved instances do not keep their JSON by default"""
+        bm = BaseModel()
+        with mock.patch.object(models.base_model, "KEEP_JSON", False):
+            self.assertEqual(json.loads(bm.to_json())["id"], bm.id)
+        self.assertIsNone(bm._encoded)
+        self.assertIsNone(bm._stamps)
+        objs = [BaseModel(name="Holberton" * 10) for i in range(1000)]
+        with mock.patch.object(models.base_model, "KEEP_JSON", False):
+            tracemalloc.start()
+            for bm in objs:
+                bm.to_json()
+            kept = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+        self.assertLess(kept / len(objs), 50)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing File Storage")
+    @mock.patch.object(models.base_model, "KEEP_JSON", True)
+    def test_to_json_kept(self):
+        """test that to_json is kept until a change and to_dict is not"""
+        bm = BaseModel()
+        bm.password = "secret"
+        first = bm.to_dict()
+        first["name"] = "changed by the caller"
+        self.assertNotIn("name", bm.to_dict())
+        self.assertNotIn("password", bm.to_dict())
+        self.assertIsNot(bm.to_dict(), bm.to_dict())
+        self.assertIs(bm.to_json(), bm.to_json())
+        bm.name = "Holberton"
+        self.assertEqual(bm.to_dict()["name"], "Holberton")
+        self.assertEqual(json.loads(bm.to_json())["name"], "Holberton")
+        del bm.name
+        self.assertNotIn("name", bm.to_dict())
+        self.assertNotIn("name", bm.to_json())
+        bm.tags = []
+        bm.to_json()
+        bm.tags.append("pool")
+        self.assertEqual(json.loads(bm.to_json())["tags"], ["pool"])
+
     def test_str(self):
         """test that the str method has the correct output"""
         inst = BaseModel()
@@ -0,0 +1,71 @@
+#!/usr/bin/python3
+"""Test the JSON codec shared by the storage and the API"""
+from datetime import datetime
+import json
+from models import codec
+import pep8 as pycodestyle
+import unittest
+
+SAMPLE = {"id": "1", "name": "Lagos é", "number_rooms": 3,
+          "latitude": 6.45, "amenity_ids": ["a", "b"], "text": None,
+          "nested": {"ok": True, "quote": "\"/\\"}}
+
+
+class TestCodec(unittest.TestCase):
+    """Tests every installed codec against the standard library"""
+
+    def tearDown(self):
+        """Go back to the configured codec"""
+        codec.select(codec.CODEC)
+
+    def test_pep8_conformance(self):
+        """Test that models/codec.py conforms to PEP8."""
+        for path in ['models/codec.py', 'api/v1/json_provider.py',
+                     'tests/test_models/test_codec.py']:
+            with self.subTest(path=path):
+                errors = pycodestyle.Checker(path).check_all()
+                self.assertEqual(errors, 0)
+
+    def test_select(self):
+        """Test auto picks a fast codec when there is one"""
+        self.assertEqual(codec.select("json"), "json")
+        self.assertEqual(codec.select("auto"), codec.preferred[0])
+        self.assertEqual(codec.select("missing"), codec.preferred[0])
+
+    def test_same_semantics(self):
+        """Test every codec reads back what the standard library reads"""
+        for name in codec.codecs:
+            with self.subTest(codec=name):
+                codec.select(name)
+                text = codec.dumps(SAMPLE)
+                self.assertIsInstance(text, str)
+                self.assertEqual(json.loads(text), SAMPLE)
+                self.assertEqual(codec.loads(json.dumps(SAMPLE)), SAMPLE)
+                self.assertEqual(codec.loads(text.encode("utf-8")), SAMPLE)
+                self.assertEqual(list(json.loads(codec.dumps(
+                    {"b": 1, "a": 2}, sort_keys=True))), ["a", "b"])
+
+    def test_non_finite(self):
+        """Test every codec writes NaN and infinities like the library"""
+        obj = {"latitude": float("nan"), "nested": [float("inf"), None],
+               "longitude": -float("inf"), "text": None}
+        for name in codec.codecs:
+            with self.subTest(codec=name):
+                codec.select(name)
+                self.assertEqual(codec.dumps(obj).replace(" ", ""),
+                                 json.dumps(obj).replace(" ", ""))
+
+    def test_fallbacks(self):
+        """Test what a codec cannot handle goes to the standard library"""
+        for name in codec.codecs:
+            with self.subTest(codec=name):
+                codec.select(name)
+                self.assertEqual(json.loads(codec.dumps([2 ** 70])),
+                                 [2 ** 70])
+                self.assertEqual(codec.dumps(datetime(2020, 1, 2),
+                                             default=str),
+                                 '"2020-01-02 00:00:00"')
+                with self.assertRaises(TypeError):
+                    codec.dumps(datetime(2020, 1, 2))
+                with self.assertRaises(ValueError):
+                    codec.loads("{bad")
@@ -18,6 +18,7 @@ import json
 import os
 import pep8
 import unittest
+from unittest import mock
 DBStorage = db_storage.DBStorage
 classes = {"Amenity": Amenity, "City": City, "Place": Place,
            "Review": Review, "State": State, "User": User}
@@ -177,3 +178,92 @@ class TestDBStorage(unittest.TestCase):
 
         all_count = models.storage.count()
         self.assertEqual(all_count, len(storage.all()))
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_eager_loading(self):
+        """Test that eager paths are loaded with every strategy"""
+        state = State(name="Enugu")
+        models.storage.new(state)
+        models.storage.save()
+        city = City(name="Nsukka", state_id=state.id)
+        models.storage.new(city)
+        models.storage.save()
+        for strategy in ("joined", "selectin", "subquery"):
+            with self.subTest(strategy=strategy):
+                models.storage.close()
+                models.storage.reload()
+                states = models.storage.all(State, eager=("cities",),
+                                            strategy=strategy)
+                loaded = states["State." + state.id]
+                self.assertIn("cities", loaded.__dict__)
+                self.assertEqual([c.id for c in loaded.cities], [city.id])
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_timestamps_keep_microseconds(self):
+        """Test that MySQL keeps the microseconds of the versions"""
+        from sqlalchemy.dialects import mysql
+        from sqlalchemy.schema import CreateTable
+        ddl = str(CreateTable(State.__table__).compile(
+            dialect=mysql.dialect()))
+        self.assertIn("updated_at DATETIME(6)", ddl)
+        self.assertIn("created_at DATETIME(6)", ddl)
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_save_notifies_cascades(self):
+        """Test that listeners hear about the rows deleted by cascades"""
+        state = State(name="Kano")
+        models.storage.new(state)
+        city = City(name="Fagge", state_id=state.id)
+        models.storage.new(city)
+        models.storage.save()
+        notified = []
+        models.storage.subscribe(notified.append)
+        try:
+            models.storage.close()
+            models.storage.delete(models.storage.get(State, state.id))
+            models.storage.save()
+        finally:
+            models.storage._DBStorage__listeners.remove(notified.append)
+        self.assertEqual(sorted(obj.id for obj in notified),
+                         sorted([state.id, city.id]))
+
+
+class TestDBStoragePool(unittest.TestCase):
+    """Test the connection pool settings of DBStorage"""
+    def test_pool_from_environment(self):
+        """Test that the pool is configured from the HBNB_* environment"""
+        env = {"HBNB_MYSQL_URL": "sqlite:///test_pool.db",
+               "HBNB_MYSQL_POOL_SIZE": "3",
+               "HBNB_MYSQL_MAX_OVERFLOW": "2",
+               "HBNB_MYSQL_POOL_TIMEOUT": "4",
+               "HBNB_MYSQL_POOL_RECYCLE": "60",
+               "HBNB_MYSQL_POOL_PRE_PING": "0",
+               "HBNB_ENV": ""}
+        with mock.patch.dict(os.environ, env):
+            storage = DBStorage()
+        pool = storage._DBStorage__engine.pool
+        self.assertIsInstance(pool, db_storage.TimedQueuePool)
+        self.assertEqual(pool.size(), 3)
+        self.assertEqual(pool._max_overflow, 2)
+        self.assertEqual(pool._timeout, 4)
+        self.assertEqual(pool._recycle, 60)
+        self.assertFalse(pool._pre_ping)
+
+    def test_pool_stats(self):
+        """Test that checkouts are counted in pool_stats"""
+        env = {"HBNB_MYSQL_URL": "sqlite:///test_pool.db", "HBNB_ENV": ""}
+        with mock.patch.dict(os.environ, env):
+            storage = DBStorage()
+        with storage._DBStorage__engine.connect():
+            stats = storage.pool_stats()
+            self.assertEqual(stats["checked_out"], 1)
+        stats = storage.pool_stats()
+        self.assertEqual(stats["checked_out"], 0)
+        self.assertEqual(stats["checkouts"], 1)
+        self.assertEqual(stats["timeouts"], 0)
+        self.assertGreaterEqual(stats["wait_seconds"], 0)
+
+    def tearDown(self):
+        """Remove the SQLite stand-in database"""
+        if os.path.exists("test_pool.db"):
+            os.remove("test_pool.db")
@@ -4,6 +4,7 @@ Contains the TestFileStorageDocs classes
 """
 
 from datetime import datetime
+import glob
 import inspect
 import models
 from models.engine import file_storage
@@ -17,8 +18,12 @@ from models.user import User
 import json
 import os
 import pep8
+import threading
 import unittest
+from unittest import mock
 FileStorage = file_storage.FileStorage
+time_format = "%Y-%m-%dT%H:%M:%S.%f"
+json_format = os.getenv("HBNB_FILE_FORMAT", "json") == "json"
 classes = {"Amenity": Amenity, "BaseModel": BaseModel, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
 
@@ -95,6 +100,7 @@ class TestFileStorage(unittest.TestCase):
         FileStorage._FileStorage__objects = save
 
     @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    @unittest.skipIf(not json_format, "not testing the JSON format")
     def test_save(self):
         """Test that save properly saves objects to file.json"""
         storage = FileStorage()
@@ -105,7 +111,8 @@ class TestFileStorage(unittest.TestCase):
             new_dict[instance_key] = instance
         save = FileStorage._FileStorage__objects
         FileStorage._FileStorage__objects = new_dict
-        storage.save()
+        with mock.patch.object(FileStorage, "_FileStorage__journal", False):
+            storage.save()
         FileStorage._FileStorage__objects = save
         for key, value in new_dict.items():
             new_dict[key] = value.to_dict()
@@ -166,3 +173,548 @@ class TestFileStorage(unittest.TestCase):
 
         all_count = models.storage.count()
         self.assertEqual(all_count, len(storage.all()))
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestFileStorageIndex(unittest.TestCase):
+    """Test the per-class index kept by FileStorage"""
+    def setUp(self):
+        """Swap in empty object stores"""
+        self.saved = (FileStorage._FileStorage__objects,
+                      FileStorage._FileStorage__classes,
+                      FileStorage._FileStorage__links,
+                      FileStorage._FileStorage__linked,
+                      FileStorage._FileStorage__created,
+                      FileStorage._FileStorage__order)
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__classes = {}
+        FileStorage._FileStorage__links = {}
+        FileStorage._FileStorage__linked = {}
+        FileStorage._FileStorage__created = {}
+        FileStorage._FileStorage__order = {}
+        self.storage = FileStorage()
+
+    def tearDown(self):
+        """Restore the original object stores"""
+        (FileStorage._FileStorage__objects,
+         FileStorage._FileStorage__classes,
+         FileStorage._FileStorage__links,
+         FileStorage._FileStorage__linked,
+         FileStorage._FileStorage__created,
+         FileStorage._FileStorage__order) = self.saved
+
+    def test_get_by_class_and_name(self):
+        """Test that get finds an object by class or class name"""
+        state = State(name="Lagos")
+        self.storage.new(state)
+        self.assertIs(self.storage.get(State, state.id), state)
+        self.assertIs(self.storage.get("State", state.id), state)
+        self.assertIsNone(self.storage.get(City, state.id))
+        self.assertIsNone(self.storage.get(State, "wrong_id"))
+        self.assertIsNone(self.storage.get("STATES", state.id))
+
+    def test_all_and_count_by_class(self):
+        """Test that all and count only see objects of the given class"""
+        states = [State(name="Oyo"), State(name="Ogun")]
+        city = City(name="Ibadan")
+        for obj in states + [city]:
+            self.storage.new(obj)
+        self.assertEqual(set(self.storage.all(State).values()), set(states))
+        self.assertEqual(self.storage.count(State), 2)
+        self.assertEqual(self.storage.count("City"), 1)
+        self.assertEqual(self.storage.count(), 3)
+        self.assertEqual(self.storage.count(Review), 0)
+        self.assertIsNone(self.storage.count("Country"))
+
+    def test_counts(self):
+        """Test that counts reports every class at once"""
+        self.storage.new(State(name="Oyo"))
+        self.storage.new(City(name="Ibadan"))
+        counts = self.storage.counts()
+        self.assertEqual(set(counts), set(classes))
+        self.assertEqual(counts["State"], 1)
+        self.assertEqual(counts["City"], 1)
+        self.assertEqual(counts["Place"], 0)
+
+    def test_delete_updates_index(self):
+        """Test that delete removes the object from the index"""
+        state = State(name="Kano")
+        self.storage.new(state)
+        self.storage.delete(state)
+        self.assertIsNone(self.storage.get(State, state.id))
+        self.assertEqual(self.storage.count(State), 0)
+        self.assertEqual(self.storage.all(State), {})
+
+    def test_related(self):
+        """Test that related objects are found through foreign keys"""
+        state = State(name="Lagos")
+        cities = [City(name="Ikeja", state_id=state.id),
+                  City(name="Epe", state_id=state.id)]
+        other = City(name="Aba", state_id="other")
+        for obj in [state, other] + cities:
+            self.storage.new(obj)
+        self.assertEqual(state.cities, cities)
+        self.assertEqual(self.storage.related(City, "state_id", "other"),
+                         [other])
+        self.assertEqual(self.storage.related(City, "state_id", "none"), [])
+
+    def test_related_follows_updates(self):
+        """Test that the foreign key index follows changes and deletes"""
+        state = State(name="Lagos")
+        city = City(name="Ikeja", state_id=state.id)
+        self.storage.new(state)
+        self.storage.new(city)
+        city.state_id = "moved"
+        self.assertEqual(state.cities, [])
+        self.assertEqual(self.storage.related(City, "state_id", "moved"),
+                         [city])
+        self.storage.delete(city)
+        self.assertEqual(self.storage.related(City, "state_id", "moved"), [])
+
+    def test_place_relationships(self):
+        """Test the reviews, amenities and places relationships"""
+        user = User(email="a@b.c")
+        city = City(name="Ikeja")
+        amenity = Amenity(name="Wifi")
+        place = Place(city_id=city.id, user_id=user.id,
+                      amenity_ids=[amenity.id])
+        review = Review(place_id=place.id, user_id=user.id)
+        for obj in (user, city, amenity, place, review):
+            self.storage.new(obj)
+        self.assertEqual(city.places, [place])
+        self.assertEqual(user.places, [place])
+        self.assertEqual(user.reviews, [review])
+        self.assertEqual(place.reviews, [review])
+        self.assertEqual(place.amenities, [amenity])
+
+    def test_search_places(self):
+        """Test that search_places combines state, city and amenity filters"""
+        lagos, oyo = State(name="Lagos"), State(name="Oyo")
+        ikeja = City(name="Ikeja", state_id=lagos.id)
+        ibadan = City(name="Ibadan", state_id=oyo.id)
+        wifi, pool = Amenity(name="Wifi"), Amenity(name="Pool")
+        first = Place(city_id=ikeja.id, amenity_ids=[wifi.id, pool.id])
+        second = Place(city_id=ibadan.id, amenity_ids=[wifi.id])
+        third = Place(city_id=ibadan.id)
+        for obj in (lagos, oyo, ikeja, ibadan, wifi, pool,
+                    first, second, third):
+            self.storage.new(obj)
+        search = self.storage.search_places
+        self.assertEqual(search(), [first, second, third])
+        self.assertEqual(search(states=[lagos.id]), [first])
+        self.assertEqual(search(states=[lagos.id], cities=[ibadan.id]),
+                         [first, second, third])
+        self.assertEqual(search(amenities=[wifi.id]), [first, second])
+        self.assertEqual(search(cities=[ibadan.id], amenities=[wifi.id]),
+                         [second])
+        self.assertEqual(search(amenities=[wifi.id, pool.id]), [first])
+        self.assertEqual(search(states=["unknown"]), [])
+
+    def test_page(self):
+        """Test keyset pages ordered by creation date then id"""
+        states = [State(name=str(i)) for i in range(5)]
+        for state in reversed(states):
+            self.storage.new(state)
+        first = self.storage.page(State, 2)
+        self.assertEqual(first, states[:2])
+        after = (first[-1].created_at.strftime(time_format), first[-1].id)
+        self.assertEqual(self.storage.page(State, 2, after), states[2:4])
+        self.storage.delete(states[2])
+        late = State(name="late")
+        self.storage.new(late)
+        self.assertEqual(self.storage.page(State, 10, after),
+                         [states[3], states[4], late])
+
+    def test_page_where(self):
+        """Test that pages can be restricted by foreign key"""
+        state = State(name="Lagos")
+        cities = [City(name=str(i), state_id=state.id) for i in range(3)]
+        for obj in [state, City(name="other")] + cities:
+            self.storage.new(obj)
+        self.assertEqual(self.storage.page(City, 2, state_id=state.id),
+                         cities[:2])
+
+    def test_reload_builds_index(self):
+        """Test that reload indexes the objects read from the JSON file"""
+        saved = FileStorage._FileStorage__file_path
+        FileStorage._FileStorage__file_path = "test_index.json"
+        try:
+            state = State(name="Enugu")
+            self.storage.new(state)
+            self.storage.save()
+            FileStorage._FileStorage__objects = {}
+            FileStorage._FileStorage__classes = {}
+            self.storage.reload()
+            self.assertEqual(self.storage.get(State, state.id).name, "Enugu")
+            self.assertEqual(self.storage.count(State), 1)
+        finally:
+            FileStorage._FileStorage__file_path = saved
+            for name in ("test_index.json", "test_index.json.journal"):
+                if os.path.exists(name):
+                    os.remove(name)
+
+    def test_stale_journal_is_dropped(self):
+        """Test that a journal older than its snapshot is not replayed"""
+        saved = FileStorage._FileStorage__file_path
+        FileStorage._FileStorage__file_path = "test_index.json"
+        try:
+            state = State(name="Stale")
+            with open("test_index.json.journal", "w") as f:
+                f.write(json.dumps({"key": "State." + state.id,
+                                    "value": state.to_dict()}) + "\n")
+            self.storage.reload()
+            self.assertIsNone(self.storage.get(State, state.id))
+            self.assertFalse(os.path.exists("test_index.json.journal"))
+            with open("test_index.json.journal", "w") as f:
+                f.write(json.dumps({"key": "State." + state.id,
+                                    "value": state.to_dict()}) + "\n")
+            with open("test_index.json", "w") as f:
+                f.write("{}")
+            os.utime("test_index.json.journal", (0, 0))
+            self.storage.reload()
+            self.assertIsNone(self.storage.get(State, state.id))
+            self.assertFalse(os.path.exists("test_index.json.journal"))
+        finally:
+            FileStorage._FileStorage__file_path = saved
+            for name in ("test_index.json", "test_index.json.journal"):
+                if os.path.exists(name):
+                    os.remove(name)
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+@unittest.skipIf(not json_format, "not testing the JSON format")
+class TestFileStorageJournal(unittest.TestCase):
+    """Test the journaled save mode of FileStorage"""
+    def setUp(self):
+        """Swap in empty object stores and turn the journal on"""
+        self.saved = (FileStorage._FileStorage__objects,
+                      FileStorage._FileStorage__classes,
+                      FileStorage._FileStorage__file_path,
+                      FileStorage._FileStorage__journal,
+                      FileStorage._FileStorage__compact_after)
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__classes = {}
+        FileStorage._FileStorage__file_path = "test_journal.json"
+        FileStorage._FileStorage__journal = True
+        self.storage = FileStorage()
+        self.storage.compact()
+
+    def tearDown(self):
+        """Restore the original object stores and remove test files"""
+        (FileStorage._FileStorage__objects,
+         FileStorage._FileStorage__classes,
+         FileStorage._FileStorage__file_path,
+         FileStorage._FileStorage__journal,
+         FileStorage._FileStorage__compact_after) = self.saved
+        for name in ("test_journal.json", "test_journal.json.journal"):
+            if os.path.exists(name):
+                os.remove(name)
+
+    def reloaded(self):
+        """Return a fresh view of what is on disk"""
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__classes = {}
+        self.storage.reload()
+        return self.storage
+
+    def test_save_appends_changes_only(self):
+        """Test that save appends the changed objects to the journal"""
+        state = State(name="Lagos")
+        state.save()
+        with open("test_journal.json") as f:
+            self.assertEqual(json.load(f), {})
+        with open("test_journal.json.journal") as f:
+            self.assertEqual(len(f.readlines()), 1)
+        self.assertEqual(self.reloaded().get(State, state.id).name, "Lagos")
+
+    def test_delete_is_replayed(self):
+        """Test that deletions written to the journal survive a reload"""
+        state = State(name="Kano")
+        state.save()
+        self.storage.delete(state)
+        self.storage.save()
+        self.assertIsNone(self.reloaded().get(State, state.id))
+
+    def test_compaction(self):
+        """Test that a long journal is folded back into the file"""
+        FileStorage._FileStorage__compact_after = 2
+        states = [State(name=str(i)) for i in range(3)]
+        for state in states:
+            state.save()
+        self.assertFalse(os.path.exists("test_journal.json.journal"))
+        with open("test_journal.json") as f:
+            self.assertEqual(len(json.load(f)), 3)
+        self.assertEqual(self.reloaded().count(State), 3)
+
+    def test_partial_record_is_dropped(self):
+        """Test that a truncated journal record is ignored and removed"""
+        state = State(name="Oyo")
+        state.save()
+        with open("test_journal.json.journal", "a") as f:
+            f.write('{"key": "State.x", "val')
+        self.assertEqual(self.reloaded().count(State), 1)
+        City(name="Ibadan").save()
+        self.assertEqual(self.reloaded().count(City), 1)
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+@unittest.skipIf(not json_format, "not testing the JSON format")
+class TestFileStorageAtomicSave(unittest.TestCase):
+    """Test that FileStorage snapshots are written atomically"""
+    def setUp(self):
+        """Use a separate file for the snapshot, saved without a journal"""
+        self.saved = (FileStorage._FileStorage__file_path,
+                      FileStorage._FileStorage__fsync,
+                      FileStorage._FileStorage__journal)
+        FileStorage._FileStorage__file_path = "test_atomic.json"
+        FileStorage._FileStorage__journal = False
+        self.storage = FileStorage()
+
+    def tearDown(self):
+        """Restore the file path, the fsync policy and the journal"""
+        (FileStorage._FileStorage__file_path,
+         FileStorage._FileStorage__fsync,
+         FileStorage._FileStorage__journal) = self.saved
+        for name in ["test_atomic.json"] + glob.glob("test_atomic.json.*"):
+            if os.path.exists(name):
+                os.remove(name)
+
+    def test_failed_save_keeps_old_file(self):
+        """Test that an interrupted save leaves the previous snapshot"""
+        state = State(name="Abia")
+        self.storage.new(state)
+        self.storage.save()
+        with open("test_atomic.json") as f:
+            before = f.read()
+        with mock.patch("models.codec.dumps", side_effect=OSError):
+            with self.assertRaises(OSError):
+                self.storage.save()
+        self.storage.delete(state)
+        with open("test_atomic.json") as f:
+            self.assertEqual(f.read(), before)
+        self.assertEqual(glob.glob("test_atomic.json.*"), [])
+
+    def test_threaded_saves(self):
+        """Test that saves from several threads never collide"""
+        FileStorage._FileStorage__fsync = 'never'
+        state = State(name="Threads")
+        self.storage.new(state)
+        errors = []
+
+        def save():
+            """saves a few times, keeping the errors"""
+            try:
+                for i in range(10):
+                    self.storage.save()
+            except Exception as error:
+                errors.append(error)
+        threads = [threading.Thread(target=save) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.storage.delete(state)
+        self.assertEqual(errors, [])
+        with open("test_atomic.json") as f:
+            self.assertIn("State." + state.id, json.load(f))
+        self.assertEqual(glob.glob("test_atomic.json.*"), [])
+
+    def test_fsync_policy(self):
+        """Test that the fsync policy decides when writes are synced"""
+        for policy, calls in (('always', 2), ('never', 0)):
+            with self.subTest(policy=policy):
+                FileStorage._FileStorage__fsync = policy
+                with mock.patch("os.fsync") as fsync:
+                    self.storage.save()
+                self.assertEqual(fsync.call_count, calls)
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+@unittest.skipIf(not json_format, "not testing the JSON format")
+class TestFileStorageLazyReload(unittest.TestCase):
+    """Test that FileStorage streams file.json and builds objects on use"""
+    def setUp(self):
+        """Write a small store to a separate file"""
+        self.saved = (FileStorage._FileStorage__objects,
+                      FileStorage._FileStorage__classes,
+                      FileStorage._FileStorage__file_path)
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__classes = {}
+        FileStorage._FileStorage__file_path = "test_lazy.json"
+        self.storage = FileStorage()
+        self.state = State(name="Lagos")
+        self.city = City(name="Ikeja", state_id=self.state.id)
+        self.storage.new(self.state)
+        self.storage.new(self.city)
+        self.storage.save()
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__classes = {}
+        self.storage.reload()
+
+    def tearDown(self):
+        """Restore the original object stores"""
+        (FileStorage._FileStorage__objects,
+         FileStorage._FileStorage__classes,
+         FileStorage._FileStorage__file_path) = self.saved
+        os.remove("test_lazy.json")
+
+    def test_records_stay_raw_until_used(self):
+        """Test that reload keeps records and get builds the object"""
+        objects = FileStorage._FileStorage__objects
+        self.assertEqual(self.storage.count(State), 1)
+        self.assertIs(type(objects["State." + self.state.id]), dict)
+        state = self.storage.get(State, self.state.id)
+        self.assertIs(type(state), State)
+        self.assertIs(type(state.created_at), datetime)
+        self.assertIs(objects["State." + self.state.id], state)
+        self.assertIs(type(objects["City." + self.city.id]), dict)
+
+    def test_all_builds_objects(self):
+        """Test that all never returns raw records"""
+        self.assertIs(type(list(self.storage.all(City).values())[0]), City)
+        for obj in self.storage.all().values():
+            self.assertIsInstance(obj, BaseModel)
+
+    def test_save_keeps_raw_records(self):
+        """Test that records never used are written back unchanged"""
+        with open("test_lazy.json") as f:
+            before = json.load(f)
+        self.storage.save()
+        with open("test_lazy.json") as f:
+            self.assertEqual(json.load(f), before)
+
+    def test_close_skips_unchanged_files(self):
+        """Test that close only reloads after the files changed"""
+        state = self.storage.get(State, self.state.id)
+        self.storage.close()
+        self.assertIs(self.storage.get(State, self.state.id), state)
+        with open("test_lazy.json", "a") as f:
+            f.write(" ")
+        self.storage.close()
+        self.assertIsNot(self.storage.get(State, self.state.id), state)
+
+    def test_version_follows_changes(self):
+        """Test that the version of a class changes with its objects"""
+        token, modified = self.storage.version(State)
+        self.assertEqual(self.storage.version("State"), (token, modified))
+        city_token = self.storage.version(City)[0]
+        state = State(name="Kano")
+        self.storage.new(state)
+        self.assertNotEqual(self.storage.version(State)[0], token)
+        self.assertGreaterEqual(self.storage.version(State)[1], modified)
+        token = self.storage.version(State)[0]
+        self.storage.delete(state)
+        self.assertNotEqual(self.storage.version(State)[0], token)
+        self.assertEqual(self.storage.version(City)[0], city_token)
+
+    def test_get_many(self):
+        """Test that get_many returns known objects in the order asked"""
+        objs = self.storage.get_many(State, ["nope", self.state.id,
+                                             self.state.id, 3])
+        self.assertEqual([obj.id for obj in objs], [self.state.id])
+        self.assertIs(type(objs[0]), State)
+        self.assertEqual(self.storage.get_many("Nope", [self.state.id]), [])
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestFileStorageSnapshot(unittest.TestCase):
+    """Test that FileStorage writes and reads binary snapshots"""
+    def setUp(self):
+        """Write a small store to a separate binary snapshot"""
+        self.saved = (FileStorage._FileStorage__objects,
+                      FileStorage._FileStorage__classes,
+                      FileStorage._FileStorage__file_path,
+                      FileStorage._FileStorage__format,
+                      FileStorage._FileStorage__journal)
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__classes = {}
+        FileStorage._FileStorage__file_path = "test_snapshot.bin"
+        FileStorage._FileStorage__format = "binary"
+        FileStorage._FileStorage__journal = False
+        self.storage = FileStorage()
+        self.state = State(name="Lagos")
+        self.user = User(email="a@b.c", password="secret")
+        self.storage.new(self.state)
+        self.storage.new(self.user)
+        self.storage.save()
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__classes = {}
+        self.storage.reload()
+
+    def tearDown(self):
+        """Restore the original object stores and format"""
+        (FileStorage._FileStorage__objects,
+         FileStorage._FileStorage__classes,
+         FileStorage._FileStorage__file_path,
+         FileStorage._FileStorage__format,
+         FileStorage._FileStorage__journal) = self.saved
+        for name in ("test_snapshot.bin", "test_snapshot.json"):
+            if os.path.exists(name):
+                os.remove(name)
+
+    def test_reload(self):
+        """Test that a binary snapshot reloads the same records"""
+        self.assertEqual(self.storage.count(), 2)
+        state = self.storage.get(State, self.state.id)
+        self.assertEqual(state.to_dict(), self.state.to_dict())
+        self.assertEqual(self.storage.get(User, self.user.id).to_dict(),
+                         self.user.to_dict())
+
+    def test_reads_json_too(self):
+        """Test that a binary store still reloads a JSON file"""
+        FileStorage._FileStorage__format = "json"
+        self.storage.save()
+        with open("test_snapshot.bin") as f:
+            self.assertEqual(json.load(f)["State." + self.state.id]["name"],
+                             "Lagos")
+        FileStorage._FileStorage__format = "binary"
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__classes = {}
+        self.storage.reload()
+        self.assertEqual(self.storage.get(State, self.state.id).name,
+                         "Lagos")
+
+    def test_unchanged_sections_copied(self):
+        """Test that only the sections of changed classes are packed"""
+        pack = mock.patch.object(file_storage.snapshot, "pack",
+                                 wraps=file_storage.snapshot.pack)
+        with pack as packed:
+            self.storage.save()
+        packed.assert_not_called()
+        self.storage.new(State(name="Kano"))
+        with pack as packed:
+            self.storage.save()
+        self.assertEqual(packed.call_count, 1)
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__classes = {}
+        self.storage.reload()
+        self.assertEqual(self.storage.count(State), 2)
+        self.assertEqual(self.storage.count(User), 1)
+
+    def test_built_objects_packed(self):
+        """Test that objects changed in place are saved"""
+        self.storage.get(State, self.state.id).name = "Abuja"
+        self.storage.save()
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__classes = {}
+        self.storage.reload()
+        self.assertEqual(self.storage.get(State, self.state.id).name,
+                         "Abuja")
+
+    def test_indexes_loaded(self):
+        """Test that the indexes saved with a section are loaded"""
+        city = City(name="Ikeja", state_id=self.state.id)
+        self.storage.new(city)
+        self.storage.save()
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__classes = {}
+        with mock.patch.object(FileStorage, "_FileStorage__links", {}), \
+                mock.patch.object(FileStorage, "_FileStorage__linked", {}), \
+                mock.patch.object(FileStorage, "_link") as link:
+            self.storage.reload()
+            link.assert_not_called()
+            cities = self.storage.related(City, "state_id", self.state.id)
+            self.assertEqual([c.id for c in cities], [city.id])
+            self.storage.delete(cities[0])
+            self.assertEqual(
+                self.storage.related(City, "state_id", self.state.id), [])
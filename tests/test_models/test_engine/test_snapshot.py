@@ -0,0 +1,102 @@
+#!/usr/bin/python3
+"""Test the binary snapshot format of FileStorage"""
+import io
+import json
+from models.engine import snapshot
+import os
+import pep8 as pycodestyle
+import pickle
+import unittest
+
+SECTIONS = {"State": {"State.1": {
+                "__class__": "State", "id": "1", "name": "Lagos",
+                "created_at": "2017-09-28T21:03:54.052298"}},
+            "City": {"City.2": {"__class__": "City", "id": "2",
+                                "name": "Ikeja", "state_id": "1"},
+                     "City.3": {"__class__": "City", "id": "3",
+                                "name": "Ibadan é", "state_id": "1"}}}
+
+
+class TestSnapshot(unittest.TestCase):
+    """Test writing, reading and converting snapshots"""
+
+    def tearDown(self):
+        """Remove the converted files"""
+        for name in ("test_convert.json", "test_convert.bin",
+                     "test_convert.back.json"):
+            if os.path.exists(name):
+                os.remove(name)
+
+    def snapshot(self):
+        """returns the bytes of the snapshot of SECTIONS"""
+        f = io.BytesIO()
+        snapshot.write(f, {name: (len(objects), snapshot.pack(objects))
+                           for name, objects in SECTIONS.items()})
+        return f.getvalue()
+
+    def test_pep8_conformance(self):
+        """Test that models/engine/snapshot.py conforms to PEP8."""
+        for path in ['models/engine/snapshot.py',
+                     'tests/test_models/test_engine/test_snapshot.py']:
+            with self.subTest(path=path):
+                errors = pycodestyle.Checker(path).check_all()
+                self.assertEqual(errors, 0)
+
+    def test_round_trip(self):
+        """Test that every record is read back under its key"""
+        data = self.snapshot()
+        self.assertTrue(data.startswith(snapshot.MAGIC))
+        records = dict(snapshot.read(io.BytesIO(data)))
+        self.assertEqual(list(records), ["State.1", "City.2", "City.3"])
+        self.assertEqual(records["City.3"], SECTIONS["City"]["City.3"])
+        self.assertEqual(list(snapshot.read(io.BytesIO(data), {"State"})),
+                         list(SECTIONS["State"].items()))
+
+    def test_indexes(self):
+        """Test that a section keeps the indexes packed with its records"""
+        links = {"state_id": {"1": {"City.2": None, "City.3": None}}}
+        f = io.BytesIO()
+        table = snapshot.write(f, {"City": (2, snapshot.pack(
+            SECTIONS["City"], links=links))})
+        self.assertEqual(table, snapshot.sections(f))
+        name, section = next(snapshot.read_sections(f))
+        self.assertEqual(section, {"objects": SECTIONS["City"],
+                                   "links": links})
+        blob = snapshot.packed(f, table[0])
+        self.assertEqual(pickle.loads(blob), section)
+
+    def test_sections(self):
+        """Test the section table counts the records of every class"""
+        table = snapshot.sections(io.BytesIO(self.snapshot()))
+        self.assertEqual([(name, count) for name, count, *_ in table],
+                         [("State", 1), ("City", 2)])
+
+    def test_corruption(self):
+        """Test truncated or altered snapshots are refused"""
+        data = self.snapshot()
+        with self.assertRaises(ValueError):
+            list(snapshot.read(io.BytesIO(data[:-3])))
+        altered = bytearray(data)
+        altered[len(snapshot.MAGIC) + 8] ^= 0xff
+        with self.assertRaises(ValueError):
+            list(snapshot.read(io.BytesIO(bytes(altered))))
+
+    def test_no_code(self):
+        """Test a snapshot cannot make the reader load classes"""
+        blob = pickle.dumps([{"id": "1", "run": os.system}])
+        with self.assertRaises(pickle.UnpicklingError):
+            snapshot.Unpickler(io.BytesIO(blob)).load()
+
+    def test_convert(self):
+        """Test converting file.json to a snapshot and back"""
+        objs = dict(snapshot.read(io.BytesIO(self.snapshot())))
+        with open("test_convert.json", "w") as f:
+            json.dump(objs, f)
+        self.assertEqual(snapshot.convert("test_convert.json",
+                                          "test_convert.bin"), "snapshot")
+        self.assertTrue(snapshot.is_snapshot("test_convert.bin"))
+        self.assertFalse(snapshot.is_snapshot("test_convert.json"))
+        self.assertEqual(snapshot.convert("test_convert.bin",
+                                          "test_convert.back.json"), "json")
+        with open("test_convert.back.json", encoding="utf-8") as f:
+            self.assertEqual(json.load(f), objs)
@@ -0,0 +1,56 @@
+#!/usr/bin/python3
+"""Test the timestamp codec of the models"""
+from datetime import datetime
+import models
+from models.base_model import BaseModel
+from models.timestamps import canonical, parse, stringify, time
+import pep8 as pycodestyle
+import unittest
+
+
+class TestTimestamps(unittest.TestCase):
+    """Tests the timestamp codec against strptime and strftime"""
+
+    def test_pep8_conformance(self):
+        """Test that models/timestamps.py conforms to PEP8."""
+        for path in ['models/timestamps.py',
+                     'tests/test_models/test_timestamps.py']:
+            with self.subTest(path=path):
+                errors = pycodestyle.Checker(path).check_all()
+                self.assertEqual(errors, 0)
+
+    def test_stringify(self):
+        """Test stringify writes what strftime writes"""
+        for value in (datetime(2017, 9, 28, 21, 3, 54, 52298),
+                      datetime(2017, 9, 28), datetime(999, 1, 2, 3, 4, 5)):
+            with self.subTest(value=value):
+                self.assertEqual(stringify(value), value.strftime(time))
+                self.assertTrue(canonical(stringify(value)) or
+                                value.year < 1000)
+
+    def test_parse(self):
+        """Test parse reads what strptime reads, and rejects the rest"""
+        for text in ("2017-09-28T21:03:54.052298",
+                     "2017-09-28T21:03:54.000000", "2017-09-28T21:03:54.5"):
+            with self.subTest(text=text):
+                self.assertEqual(parse(text), datetime.strptime(text, time))
+        for text in ("2017-09-28 21:03:54.052298", "2017-09-28T21:03:54",
+                     "2017-09-28T21:03:54.0+0100", "x" * 26):
+            with self.subTest(text=text):
+                with self.assertRaises(ValueError):
+                    parse(text)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing File Storage")
+    def test_stamp_cache(self):
+        """Test formatted timestamps are kept until the attribute changes"""
+        text = "2017-09-28T21:03:54.052298"
+        bm = BaseModel(created_at=text, updated_at=text)
+        self.assertIsNone(bm._stamps)
+        created = bm.stamp("created_at")
+        self.assertEqual(created, text)
+        self.assertIs(bm.to_dict()["created_at"], created)
+        self.assertEqual(bm.stamp("updated_at"), text)
+        bm.updated_at = datetime(2020, 1, 2)
+        self.assertEqual(bm.stamp("updated_at"), "2020-01-02T00:00:00.000000")
+        self.assertIs(bm.stamp("created_at"), created)
+        self.assertNotIn("_stamps", bm.__dict__)
@@ -0,0 +1,16 @@
+-- keeps the microseconds of the timestamps in a database created before
+-- they were DATETIME(6); create_all never alters existing tables
+-- usage: cat upgrade_mysql_timestamps.sql | mysql -uroot -p hbnb_dev_db
+
+ALTER TABLE amenities
+    MODIFY created_at DATETIME(6) NULL, MODIFY updated_at DATETIME(6) NULL;
+ALTER TABLE cities
+    MODIFY created_at DATETIME(6) NULL, MODIFY updated_at DATETIME(6) NULL;
+ALTER TABLE places
+    MODIFY created_at DATETIME(6) NULL, MODIFY updated_at DATETIME(6) NULL;
+ALTER TABLE reviews
+    MODIFY created_at DATETIME(6) NULL, MODIFY updated_at DATETIME(6) NULL;
+ALTER TABLE states
+    MODIFY created_at DATETIME(6) NULL, MODIFY updated_at DATETIME(6) NULL;
+ALTER TABLE users
+    MODIFY created_at DATETIME(6) NULL, MODIFY updated_at DATETIME(6) NULL;
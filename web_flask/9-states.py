@@ -6,7 +6,8 @@ starts a Flask web application
 from flask import Flask, render_template
 from models import *
 from models import storage
-app = Flask(__name__)
+from api.v1.compression import compress
+app = compress(Flask(__name__))
 
 
 @app.route('/states', strict_slashes=False)